@@ -1,5 +1,6 @@
 import asyncio
 import os
+import select
 import sys
 import time
 from datetime import datetime
@@ -21,6 +22,38 @@ def _db_has_column(conn: sqlite3.Connection, *, table: str, column: str) -> bool
         return False
 
 
+# Per-DB connection cache so repeated existence checks within one sync run hit
+# sqlite3's prepared-statement cache instead of reconnecting + reparsing SQL.
+_RESOURCE_CHECK_CONNS: dict[str, sqlite3.Connection] = {}
+_RESOURCE_CHECK_SCHEMA: dict[str, bool | None] = {}
+
+
+def _resource_check_conn(db_path: str) -> sqlite3.Connection:
+    conn = _RESOURCE_CHECK_CONNS.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        _RESOURCE_CHECK_CONNS[db_path] = conn
+    return conn
+
+
+def _resource_table_has_user_id(conn: sqlite3.Connection, db_path: str) -> bool | None:
+    """Return None when memu_resources does not exist yet; cache the layout otherwise."""
+    cached = _RESOURCE_CHECK_SCHEMA.get(db_path)
+    if cached is not None:
+        return cached
+
+    cursor = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='memu_resources'"
+    )
+    if not cursor.fetchone():
+        # Table may appear later (first memorize); do not cache the miss.
+        return None
+
+    has_user_id = _db_has_column(conn, table="memu_resources", column="user_id")
+    _RESOURCE_CHECK_SCHEMA[db_path] = has_user_id
+    return has_user_id
+
+
 def resource_exists(resource_url: str, user_id: str, agent_name: str) -> bool:
     try:
         dsn = agent_db_dsn(agent_name)
@@ -29,32 +62,25 @@ def resource_exists(resource_url: str, user_id: str, agent_name: str) -> bool:
         if not os.path.exists(db_path):
             return False
 
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        conn = _resource_check_conn(db_path)
 
-        # Check if table exists first
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='memu_resources'"
-        )
-        if not cursor.fetchone():
-            conn.close()
+        has_user_id = _resource_table_has_user_id(conn, db_path)
+        if has_user_id is None:
             return False
 
         # NOTE: Keep the dedupe key consistent with what Memorize stores:
         # memorize(resource_url=...) ultimately creates Resource(url=resource_url).
-        if _db_has_column(conn, table="memu_resources", column="user_id"):
-            cursor.execute(
+        if has_user_id:
+            cursor = conn.execute(
                 "SELECT 1 FROM memu_resources WHERE url = ? AND user_id = ? LIMIT 1",
                 (resource_url, user_id),
             )
         else:
-            cursor.execute(
+            cursor = conn.execute(
                 "SELECT 1 FROM memu_resources WHERE url = ? LIMIT 1",
                 (resource_url,),
             )
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
+        return cursor.fetchone() is not None
     except Exception as e:
         _log(f"DB check failed: {e}")
         return False
@@ -123,49 +149,152 @@ def _read_prev_session_ids() -> list[str]:
     return [prev_main] if prev_main else []
 
 
-def _try_acquire_lock(lock_path: str):
-    """Best-effort non-blocking lock using O_EXCL.
+def _proc_starttime(pid: int):
+    """Kernel start time (clock ticks) from /proc/<pid>/stat, or None.
 
-    This lock is PID-aware: if a stale lock file is found (PID not running),
-    it will be removed and acquisition will be retried once.
+    Field 22 overall; parsing starts after the last ')' because the comm
+    field may itself contain spaces or parentheses.
     """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+        rest = data[data.rindex(b")") + 2 :].split()
+        return int(rest[19])
+    except (OSError, ValueError, IndexError):
+        return None
 
-    def _pid_alive(pid: int) -> bool:
-        if pid <= 1:
-            return False
+
+def _lock_token() -> bytes:
+    pid = os.getpid()
+    started = _proc_starttime(pid)
+    token = f"{pid} {started}" if started is not None else str(pid)
+    return token.encode("utf-8")
+
+
+def _pid_running(pid: int) -> bool:
+    """Whether a process with this PID currently exists.
+
+    pidfd_open (Linux >= 5.3) reports an exited-but-unreaped holder as dead
+    — the pidfd polls readable — where kill(pid, 0) would still succeed.
+    Older kernels fall back to the signal probe.
+    """
+    if hasattr(os, "pidfd_open"):
         try:
-            os.kill(pid, 0)
-            return True
+            fd = os.pidfd_open(pid)
         except ProcessLookupError:
             return False
-        except PermissionError:
-            # Cannot signal, assume alive.
-            return True
+        except OSError:
+            pass
+        else:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return not poller.poll(0)
+            finally:
+                os.close(fd)
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Cannot signal, assume alive.
+        return True
+
+
+def _publish_lock(lock_path: str):
+    """Atomically create lock_path with the full holder token, or None.
 
-    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+    The token is written to a private tmp file and hard-linked into place:
+    link(2) fails if the lock exists and publishes fully-written content,
+    so a concurrent reader can never observe an empty or truncated PID the
+    way it could between an O_EXCL create and the following write.
+    """
+    tmp = f"{lock_path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    except OSError:
+        return None
     try:
-        fd = os.open(lock_path, flags)
-        os.write(fd, str(os.getpid()).encode("utf-8"))
+        os.write(fd, _lock_token())
+        os.fsync(fd)
+        os.link(tmp, lock_path)
+    except OSError:
+        # Exists (held) or link unsupported; caller handles staleness.
+        os.close(fd)
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return None
+    try:
+        os.unlink(tmp)
+    except OSError:
+        pass
+    return fd
+
+
+def _try_acquire_lock(lock_path: str):
+    """Best-effort non-blocking lock, PID-aware.
+
+    If a stale lock file is found (PID not running, or the PID number
+    recycled by a process with a different start time), it will be removed
+    and acquisition will be retried once.
+    """
+
+    def _holder_alive(content: str) -> bool:
+        parts = content.split()
+        pid = int(parts[0])
+        if pid <= 1:
+            return False
+        if not _pid_running(pid):
+            return False
+        if len(parts) > 1:
+            # kill(0) succeeded but the start time differs: the original
+            # holder died and an unrelated process now owns the PID.
+            current = _proc_starttime(pid)
+            if current is not None and current != int(parts[1]):
+                return False
+        return True
+
+    fd = _publish_lock(lock_path)
+    if fd is not None:
         return fd
-    except FileExistsError:
-        # Stale lock handling: if the PID is dead, remove and retry once.
+
+    # Stale lock handling: if the PID is dead, reclaim and retry once.
+    # The stale file is claimed with an atomic rename first — a bare
+    # unlink lets two contenders both observe staleness and one of them
+    # delete the other's freshly created lock.
+    try:
+        with open(lock_path, "r", encoding="utf-8") as f:
+            pid_str = f.read().strip()
+        if _holder_alive(pid_str):
+            return None
+
+        claimed = f"{lock_path}.stale.{os.getpid()}"
         try:
-            with open(lock_path, "r", encoding="utf-8") as f:
-                pid_str = f.read().strip()
-            pid = int(pid_str)
-            if not _pid_alive(pid):
-                try:
-                    os.remove(lock_path)
-                except FileNotFoundError:
-                    pass
-                try:
-                    fd = os.open(lock_path, flags)
-                    os.write(fd, str(os.getpid()).encode("utf-8"))
-                    return fd
-                except FileExistsError:
-                    return None
-        except Exception:
+            os.rename(lock_path, claimed)
+        except OSError:
+            # Another contender claimed it first; skip this run.
             return None
+
+        # Verify what was actually claimed: if a fresh lock replaced the
+        # stale file between the read and the rename, hand it back.
+        try:
+            with open(claimed, "r", encoding="utf-8") as f:
+                claimed_content = f.read().strip()
+            if _holder_alive(claimed_content):
+                os.rename(claimed, lock_path)
+                return None
+        except (OSError, ValueError):
+            pass
+        try:
+            os.remove(claimed)
+        except OSError:
+            pass
+
+        return _publish_lock(lock_path)
+    except Exception:
         return None
 
 
@@ -677,6 +806,41 @@ async def sync_once(user_id: str = "default") -> None:
         _release_lock(lock_name, lock_fd)
 
 
+def _run_server_loop(user_id: str) -> None:
+    """Resident worker mode: run one sync per line received on stdin.
+
+    The watcher writes either a bare "GO" token or a JSON object of env
+    overrides per trigger (MEMU_CHANGED_PATH, MEMU_PREV_SESSION_IDS, ...).
+    Overrides are applied for that run only and restored afterwards so
+    trigger-scoped keys do not leak into later runs. EOF on stdin (the
+    watcher exiting) ends the loop.
+    """
+    _log("auto_sync server mode: waiting for sync tokens on stdin")
+    for line in sys.stdin:
+        token = line.strip()
+        overrides: dict[str, str] = {}
+        if token and token != "GO":
+            try:
+                loaded = json.loads(token)
+            except Exception:
+                _log(f"ignoring malformed sync token: {token[:200]}")
+                continue
+            if isinstance(loaded, dict):
+                overrides = {str(k): str(v) for k, v in loaded.items() if v is not None}
+        saved = {k: os.environ.get(k) for k in overrides}
+        os.environ.update(overrides)
+        try:
+            asyncio.run(sync_once(user_id=user_id))
+        except Exception as e:
+            _log(f"server sync failed: {type(e).__name__}: {e}")
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
 if __name__ == "__main__":
     try:
         migration = migrate_legacy_single_db_to_agent_db(default_agent="main")
@@ -687,6 +851,9 @@ if __name__ == "__main__":
             )
     except Exception as e:
         _log(f"Migration check failed: {e}")
-    
+
     user_id = _env("MEMU_USER_ID", "default") or "default"
-    asyncio.run(sync_once(user_id=user_id))
+    if "--server" in sys.argv[1:]:
+        _run_server_loop(user_id)
+    else:
+        asyncio.run(sync_once(user_id=user_id))
@@ -12,10 +12,10 @@ Key behaviors:
 6. Clean up metadata tags and normalize formatting
 """
 
-import glob
 import hashlib
 import json
 import logging
+import mmap
 import os
 import re
 import time
@@ -24,11 +24,28 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 _sessions_dir = os.getenv("OPENCLAW_SESSIONS_DIR")
 if not _sessions_dir:
     raise ValueError("OPENCLAW_SESSIONS_DIR env var is not set")
 sessions_dir: str = _sessions_dir
 
+
+def _current_sessions_dir() -> str:
+    """Sessions root resolved at call time, not import time.
+
+    Resident sync workers apply per-run OPENCLAW_SESSIONS_DIR overrides to
+    os.environ; the import-time constant only captures the environment of
+    whichever process imported this module first, which in multi-agent
+    deployments is the watcher's global default rather than the agent's own
+    sessions directory.
+    """
+    return os.getenv("OPENCLAW_SESSIONS_DIR") or sessions_dir
+
 _memu_data_dir = os.getenv("MEMU_DATA_DIR")
 if not _memu_data_dir:
     raise ValueError("MEMU_DATA_DIR env var is not set")
@@ -39,6 +56,11 @@ STATE_VERSION = 4
 
 SAMPLE_BYTES = 64 * 1024
 
+# Transcripts at or above this size are memory-mapped for reading; resuming
+# from an offset then touches only the pages past it instead of buffering
+# the file through read() copies. Smaller files are cheaper to read outright.
+MMAP_THRESHOLD = 1024 * 1024
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,7 +88,18 @@ UUID_SESSION_RE = re.compile(
 )
 
 
+_DELETED_MARKER = ".jsonl.deleted."
+
+
 def _extract_session_id(filename: str) -> str | None:
+    # Cheap substring/suffix checks cover the two real layouts without
+    # entering the regex engine; odd names fall back to the compiled pattern.
+    i = filename.find(_DELETED_MARKER)
+    if i > 0 and len(filename) > i + len(_DELETED_MARKER):
+        return filename[:i]
+    stem = filename.removesuffix(".jsonl")
+    if stem != filename:
+        return stem or None
     m = SESSION_FILENAME_RE.match(filename)
     if not m:
         return None
@@ -75,6 +108,9 @@ def _extract_session_id(filename: str) -> str | None:
 
 
 def _extract_deleted_timestamp(filename: str) -> str:
+    head, sep, deleted_ts = filename.partition(_DELETED_MARKER)
+    if sep and head:
+        return deleted_ts
     m = SESSION_FILENAME_RE.match(filename)
     if not m:
         return ""
@@ -123,6 +159,53 @@ def _get_language_prefix() -> str | None:
     return f"[Language Context: All memory summaries extracted from this conversation must be written in {lang}.]"
 
 
+# Parsed sessions.json indexes keyed by path and revalidated with one stat
+# per call. The watcher and auto_sync re-run discovery constantly; when an
+# index is unchanged (same inode/mtime_ns/size) the read + json parse is
+# skipped. The inode guards against atomic-replace writers landing a new
+# file with identical mtime and size.
+_SESSIONS_INDEX_CACHE: dict[str, tuple[tuple[int, int, int], dict[str, Any] | None]] = {}
+
+
+def _load_sessions_index(path: Path) -> dict[str, Any] | None:
+    key = str(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        _SESSIONS_INDEX_CACHE.pop(key, None)
+        return None
+
+    sig = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _SESSIONS_INDEX_CACHE.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    payload: dict[str, Any] | None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except PermissionError:
+        logger.warning(f"sessions index is not accessible: {path}")
+        return None
+    except json.JSONDecodeError as exc:
+        logger.warning(f"sessions index is invalid JSON: {path} ({exc})")
+        payload = None
+    except OSError as exc:
+        logger.warning(f"failed reading sessions index: {path} ({exc})")
+        return None
+    else:
+        if not isinstance(payload, dict):
+            logger.warning(
+                f"sessions index has unexpected format (expected object): {path}"
+            )
+            payload = None
+
+    # Invalid content is cached too (keyed to this mtime/size) so a broken
+    # index isn't re-parsed every second until it actually changes.
+    _SESSIONS_INDEX_CACHE[key] = (sig, payload)
+    return payload
+
+
 def discover_session_files(data_root: str | Path, agents: list[str]) -> dict[str, str]:
     discovered = discover_all_session_files(data_root, agents)
     return {
@@ -165,27 +248,6 @@ def discover_all_session_files(
         except Exception:
             return False
 
-    def _load_sessions_json(path: Path) -> dict[str, Any] | None:
-        if not path.exists():
-            return None
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-        except PermissionError:
-            logger.warning(f"sessions index is not accessible: {path}")
-            return None
-        except json.JSONDecodeError as exc:
-            logger.warning(f"sessions index is invalid JSON: {path} ({exc})")
-            return None
-        except OSError as exc:
-            logger.warning(f"failed reading sessions index: {path} ({exc})")
-            return None
-
-        if not isinstance(payload, dict):
-            logger.warning(f"sessions index has unexpected format (expected object): {path}")
-            return None
-        return payload
-
     def _extract_session_ids_for_agent(
         payload: dict[str, Any],
         agent_name: str,
@@ -221,7 +283,7 @@ def discover_all_session_files(
 
         for sessions_root in deduped_roots:
             per_agent_index = sessions_root / agent_name / "sessions.json"
-            payload = _load_sessions_json(per_agent_index)
+            payload = _load_sessions_index(per_agent_index)
             if payload is None:
                 continue
 
@@ -276,7 +338,7 @@ def discover_all_session_files(
             legacy_index = sessions_root / "sessions.json"
             cache_key = str(legacy_index)
             if cache_key not in legacy_cache:
-                legacy_cache[cache_key] = _load_sessions_json(legacy_index)
+                legacy_cache[cache_key] = _load_sessions_index(legacy_index)
             payload = legacy_cache[cache_key]
             if payload is None:
                 continue
@@ -352,7 +414,7 @@ def _get_agent_session_ids(sessions_dir: str, agent_name: str) -> list[str]:
 
 
 def _get_main_session_id(agent_name: str = "main") -> str | None:
-    session_ids = _get_agent_session_ids(sessions_dir, agent_name)
+    session_ids = _get_agent_session_ids(_current_sessions_dir(), agent_name)
     return session_ids[0] if session_ids else None
 
 
@@ -362,34 +424,47 @@ def _resolve_session_file(session_id: str, agent_name: str | None = None) -> str
     Prefer active `<id>.jsonl`; fall back to latest reset/archive transcript
     generated by OpenClaw session reset flow.
     """
+    current_sessions_dir = _current_sessions_dir()
     primary_candidates = []
     if agent_name:
-        primary_candidates.append(os.path.join(sessions_dir, agent_name, f"{session_id}.jsonl"))
-    primary_candidates.append(os.path.join(sessions_dir, f"{session_id}.jsonl"))
+        primary_candidates.append(
+            os.path.join(current_sessions_dir, agent_name, f"{session_id}.jsonl")
+        )
+    primary_candidates.append(os.path.join(current_sessions_dir, f"{session_id}.jsonl"))
     for primary in primary_candidates:
         if os.path.exists(primary):
             return primary
 
     # OpenClaw reset archives old transcript as:
     #   <id>.jsonl.reset.<timestamp>
-    # Keep a conservative fallback set for historical variants.
-    candidates = []
+    # Keep a conservative fallback set for historical variants. A single
+    # scandir pass per directory replaces four glob calls: DirEntry gives
+    # name and mtime without re-statting every entry.
+    prefixes = (f"{session_id}.jsonl.reset.", f"{session_id}.jsonl.bak")
+    scan_dirs = []
     if agent_name:
-        candidates.extend(
-            glob.glob(os.path.join(sessions_dir, agent_name, f"{session_id}.jsonl.reset.*"))
-        )
-        candidates.extend(
-            glob.glob(os.path.join(sessions_dir, agent_name, f"{session_id}.jsonl.bak*"))
-        )
-    candidates.extend(glob.glob(os.path.join(sessions_dir, f"{session_id}.jsonl.reset.*")))
-    candidates.extend(glob.glob(os.path.join(sessions_dir, f"{session_id}.jsonl.bak*")))
+        scan_dirs.append(os.path.join(current_sessions_dir, agent_name))
+    scan_dirs.append(current_sessions_dir)
+
+    candidates: list[tuple[float, str]] = []
+    for scan_dir in scan_dirs:
+        try:
+            with os.scandir(scan_dir) as it:
+                for entry in it:
+                    if not entry.name.startswith(prefixes):
+                        continue
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        candidates.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
     if not candidates:
         return None
 
-    try:
-        return max(candidates, key=lambda p: os.path.getmtime(p))
-    except Exception:
-        return candidates[-1]
+    return max(candidates)[1]
 
 
 # Regex patterns for filtering
@@ -607,9 +682,19 @@ def _load_state(
 def _save_state(state: dict[str, Any], *, state_path: str | None = None) -> None:
     resolved_state_path = state_path or _legacy_state_path()
     os.makedirs(os.path.dirname(resolved_state_path), exist_ok=True)
+    if orjson is not None:
+        encoded = orjson.dumps(state, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(state, indent=2, ensure_ascii=False).encode("utf-8")
     tmp = resolved_state_path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2, ensure_ascii=False)
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, encoded)
+        # Durability before visibility: fsync the temp file so the replace
+        # never publishes a state whose bytes could still be lost to a crash.
+        os.fsync(fd)
+    finally:
+        os.close(fd)
     os.replace(tmp, resolved_state_path)
 
 
@@ -690,62 +775,111 @@ class _ReadResult:
     new_offset: int
 
 
-def _read_messages_from_jsonl(*, file_path: str, start_offset: int) -> _ReadResult:
-    """Read OpenClaw session JSONL from byte offset and extract user/assistant messages."""
-    messages: list[dict[str, str]] = []
-    new_offset = start_offset
+def _extract_message_from_entry(entry: dict[str, Any]) -> dict[str, str] | None:
+    """Filter one parsed JSONL entry down to a storable user/assistant message."""
+    if entry.get("type") != "message":
+        return None
 
-    with open(file_path, "rb") as f:
-        f.seek(max(0, start_offset))
-        while True:
-            line_start = f.tell()
-            line = f.readline()
-            if not line:
-                break
+    if _is_system_injected_entry(entry):
+        return None
 
-            complete_line = line.endswith(b"\n")
-            try:
-                entry = json.loads(line.decode("utf-8", errors="replace"))
-            except Exception:
-                if not complete_line:
-                    break
-                new_offset = f.tell()
-                continue
+    msg_obj = entry.get("message", {})
+    role = msg_obj.get("role")
 
-            new_offset = f.tell()
+    if role not in ("user", "assistant"):
+        return None
 
-            if entry.get("type") != "message":
-                continue
+    text = _extract_text_parts(msg_obj.get("content", []))
+    if not text:
+        return None
 
-            if _is_system_injected_entry(entry):
-                continue
+    if role == "user" and _is_system_injected_content(text):
+        return None
 
-            msg_obj = entry.get("message", {})
-            role = msg_obj.get("role")
+    if role == "assistant" and _is_directive_response(text):
+        return None
 
-            if role not in ("user", "assistant"):
-                continue
+    if RE_NO_REPLY.search(text):
+        return None
 
-            content_list = msg_obj.get("content", [])
-            text = _extract_text_parts(content_list)
+    text = _clean_message_text(text)
+    if not text:
+        return None
 
-            if not text:
-                continue
+    return {"role": role, "content": text}
 
-            if role == "user" and _is_system_injected_content(text):
-                continue
 
-            if role == "assistant" and _is_directive_response(text):
-                continue
+def _loads_jsonl_line(line: bytes) -> Any:
+    """Parse one transcript line, preferring orjson on the raw bytes.
 
-            if RE_NO_REPLY.search(text):
-                continue
+    orjson skips the per-line str decode entirely; lines it rejects (for
+    example invalid UTF-8 inside a string) fall back to the stdlib parse
+    over a replacing decode, preserving the old tolerance.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line.decode("utf-8", errors="replace"))
 
-            text = _clean_message_text(text)
-            if not text:
-                continue
 
-            messages.append({"role": role, "content": text})
+def _read_messages_from_jsonl(*, file_path: str, start_offset: int) -> _ReadResult:
+    """Read OpenClaw session JSONL from byte offset and extract user/assistant messages."""
+    messages: list[dict[str, str]] = []
+    start = max(0, start_offset)
+
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if start >= size:
+            return _ReadResult(messages=messages, new_offset=start_offset)
+
+        use_mmap = size >= MMAP_THRESHOLD
+        if use_mmap:
+            buf: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+            except (AttributeError, OSError):
+                pass
+            base = 0
+            pos = start
+        else:
+            f.seek(start)
+            buf = f.read()
+            base = start
+            pos = 0
+        end_pos = len(buf)
+        new_offset = start
+
+        try:
+            while pos < end_pos:
+                nl = buf.find(b"\n", pos)
+                if nl == -1:
+                    line = buf[pos:end_pos]
+                    next_pos = end_pos
+                    complete_line = False
+                else:
+                    line = buf[pos : nl + 1]
+                    next_pos = nl + 1
+                    complete_line = True
+                pos = next_pos
+
+                try:
+                    entry = _loads_jsonl_line(line)
+                except Exception:
+                    if not complete_line:
+                        break
+                    new_offset = base + next_pos
+                    continue
+
+                new_offset = base + next_pos
+
+                msg = _extract_message_from_entry(entry)
+                if msg is not None:
+                    messages.append(msg)
+        finally:
+            if use_mmap:
+                buf.close()
 
     return _ReadResult(messages=messages, new_offset=new_offset)
 
@@ -783,7 +917,7 @@ def convert(
 
     resolved_agent = (agent_name or os.getenv("MEMU_AGENT_NAME") or "main").strip() or "main"
     if session_id is None:
-        discovered = discover_all_session_files(sessions_dir, [resolved_agent])
+        discovered = discover_all_session_files(_current_sessions_dir(), [resolved_agent])
         session_files = discovered.get(resolved_agent, [])
         if not session_files:
             print(
@@ -793,6 +927,7 @@ def convert(
             return []
 
         converted_all: list[str] = []
+        extend_converted = converted_all.extend
         seen_paths: set[str] = set()
         for session_file in session_files:
             target_session_id = (
@@ -808,11 +943,12 @@ def convert(
                 memory_root=resolved_memory_root,
                 force_flush=force_flush,
             )
-            for path in converted_paths:
-                if path in seen_paths:
-                    continue
-                seen_paths.add(path)
-                converted_all.append(path)
+            # One grow per session instead of per path; a single call never
+            # repeats a path, so dedup only needs the cross-session set.
+            fresh = [p for p in converted_paths if p not in seen_paths]
+            if fresh:
+                seen_paths.update(fresh)
+                extend_converted(fresh)
         return converted_all
 
     out_dir = _conversation_dir(resolved_agent)
@@ -1238,7 +1374,7 @@ if __name__ == "__main__":
         main_id = _get_main_session_id(current_agent)
         print(f"Main session ID: {main_id}")
         if main_id:
-            main_file = os.path.join(sessions_dir, f"{main_id}.jsonl")
+            main_file = os.path.join(_current_sessions_dir(), f"{main_id}.jsonl")
             print(f"Main session file: {main_file}")
             print(f"Exists: {os.path.exists(main_file)}")
         sys.exit(0)
@@ -1,10 +1,12 @@
 import asyncio
+import fcntl
 import hashlib
 import os
 import json
 import sqlite3
 import tempfile
 from datetime import datetime
+from functools import lru_cache
 from memu.app.service import MemoryService
 from memu.app.settings import (
     CustomPrompt,
@@ -16,13 +18,20 @@ from memu.app.settings import (
     PromptBlock,
 )
 from memu.database.hybrid_factory import HybridDatabaseManager
-from memu.database.lazy_db import execute_with_locked_retry, fetch_with_locked_retry
+from memu.database.lazy_db import (
+    execute_batch_with_locked_retry,
+    execute_with_locked_retry,
+    fetch_with_locked_retry,
+)
 from memu.scope_model import AgentScopeModel
 from memu.storage_layout import migrate_legacy_single_db_to_agent_db
 from memu.storage_layout import agent_db_dsn
 
 
+@lru_cache(maxsize=None)
 def _env(name: str, default: str | None = None) -> str | None:
+    # docs_ingest is a one-shot CLI, so the environment is immutable for the
+    # lifetime of the process and repeated lookups can be memoized.
     v = os.getenv(name)
     if v is not None and str(v).strip():
         return v
@@ -46,57 +55,47 @@ def _log(msg: str) -> None:
 
 
 def _try_acquire_lock(lock_path: str):
-    """Best-effort non-blocking lock using O_EXCL (PID-aware)."""
-
-    def _pid_alive(pid: int) -> bool:
-        if pid <= 1:
-            return False
-        try:
-            os.kill(pid, 0)
-            return True
-        except ProcessLookupError:
-            return False
-        except PermissionError:
-            return True
+    """Best-effort non-blocking lock using fcntl.flock.
 
-    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+    The kernel releases the lock automatically when the holder exits, so no
+    stale-PID detection is needed. The PID is still written into the file so
+    the watcher's _is_lock_held probe keeps working.
+    """
     try:
-        fd = os.open(lock_path, flags)
-        os.write(fd, str(os.getpid()).encode("utf-8"))
-        return fd
-    except FileExistsError:
-        try:
-            with open(lock_path, "r", encoding="utf-8") as f:
-                pid_str = f.read().strip()
-            pid = int(pid_str)
-            if not _pid_alive(pid):
-                try:
-                    os.remove(lock_path)
-                except FileNotFoundError:
-                    pass
-                try:
-                    fd = os.open(lock_path, flags)
-                    os.write(fd, str(os.getpid()).encode("utf-8"))
-                    return fd
-                except FileExistsError:
-                    return None
-        except Exception:
-            return None
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except (BlockingIOError, OSError):
+        os.close(fd)
         return None
+    try:
+        os.ftruncate(fd, 0)
+        pid = os.getpid()
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+            started = int(stat[stat.rindex(b")") + 2 :].split()[19])
+            token = f"{pid} {started}"
+        except (OSError, ValueError, IndexError):
+            token = str(pid)
+        os.write(fd, token.encode("utf-8"))
+    except OSError:
+        pass
+    return fd
 
 
 def _release_lock(lock_path: str, fd) -> None:
+    # Closing the fd drops the flock. The lock file must persist: unlinking
+    # it lets one waiter lock the orphaned inode while a newcomer creates
+    # and locks a fresh file at the same path — two concurrent runs.
+    if fd is None:
+        return
     try:
-        if fd is not None:
-            try:
-                os.close(fd)
-            except OSError:
-                pass
-    finally:
-        try:
-            os.remove(lock_path)
-        except FileNotFoundError:
-            pass
+        os.close(fd)
+    except OSError:
+        pass
 
 
 def _is_under_prefix(path: str, prefix: str) -> bool:
@@ -112,38 +111,50 @@ def _is_under_prefix(path: str, prefix: str) -> bool:
 
 
 def _collect_markdown_files(
-    *, extra_paths: list[str], changed_path: str | None
+    *, extra_paths: list[str], changed_path: str | None, changed_paths: list[str] | None = None
 ) -> list[str]:
     """Collect markdown files to ingest.
 
-    - If changed_path is provided, only ingest that file (or md files under that dir),
-      and only if it is within extra_paths.
+    - If changed_path (or a changed_paths batch, as coalesced by the watcher)
+      is provided, only ingest those files (or md files under those dirs),
+      and only the ones within extra_paths.
     - Otherwise, do a full scan of extra_paths.
+
+    Deduping uses an insertion-ordered dict, so the result follows walk order
+    (extra_paths order, then directory order) without an O(N log N) sort.
+    Set MEMU_SORT_INGEST=1 to force a sorted result for reproducible runs.
     """
-    files: set[str] = set()
+    files: dict[str, None] = {}
+
+    def _finish() -> list[str]:
+        if str(os.getenv("MEMU_SORT_INGEST", "")).strip() == "1":
+            return sorted(files)
+        return list(files)
 
     def _add_file(p: str) -> None:
         if p.endswith(".md") and os.path.isfile(p):
-            files.add(os.path.abspath(p))
+            files[os.path.abspath(p)] = None
 
     def _scan_dir(d: str) -> None:
         for root, _, filenames in os.walk(d):
             for f in filenames:
                 if f.endswith(".md"):
-                    files.add(os.path.abspath(os.path.join(root, f)))
-
-    if changed_path:
-        cp = os.path.abspath(changed_path)
-        # Only ingest changes that are within configured extra paths.
-        allowed = any(_is_under_prefix(cp, p) for p in extra_paths)
-        if not allowed:
-            return []
-
-        if os.path.isfile(cp):
-            _add_file(cp)
-        elif os.path.isdir(cp):
-            _scan_dir(cp)
-        return sorted(files)
+                    files[os.path.abspath(os.path.join(root, f))] = None
+
+    batch = [p for p in (changed_paths or []) if p]
+    if changed_path and changed_path not in batch:
+        batch.append(changed_path)
+    if batch:
+        for item in batch:
+            cp = os.path.abspath(item)
+            # Only ingest changes that are within configured extra paths.
+            if not any(_is_under_prefix(cp, p) for p in extra_paths):
+                continue
+            if os.path.isfile(cp):
+                _add_file(cp)
+            elif os.path.isdir(cp):
+                _scan_dir(cp)
+        return _finish()
 
     for path_item in extra_paths:
         if not os.path.exists(path_item):
@@ -153,7 +164,7 @@ def _collect_markdown_files(
         elif os.path.isdir(path_item):
             _scan_dir(path_item)
 
-    return sorted(files)
+    return _finish()
 
 
 LANGUAGE_PROMPTS = {
@@ -218,14 +229,11 @@ def _is_same_mtime(stored_mtime: object, file_mtime: float, *, tolerance: float
 
 
 def _calculate_content_hash(file_path: str) -> str:
-    digest = hashlib.sha256()
+    # hashlib.file_digest (3.11+) hashes through a fixed C-level buffer,
+    # avoiding the Python-side read loop. Algorithm stays sha256 so hashes
+    # already persisted in the documents table remain comparable.
     with open(file_path, "rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            digest.update(chunk)
-    return digest.hexdigest()
+        return hashlib.file_digest(f, "sha256", _bufsize=1 << 20).hexdigest()
 
 
 def _get_shared_document_rows(manager: HybridDatabaseManager, *, filename: str, owner_agent_id: str) -> list[tuple[object, ...]]:
@@ -281,29 +289,27 @@ def _backfill_document_metadata(
     if not document_ids:
         return
     db = manager.get_shared_db()
-    for document_id in document_ids:
-        execute_with_locked_retry(
-            db,
-            "UPDATE documents SET content_hash = ?, mtime = ? WHERE id = ?",
-            (content_hash, mtime, document_id),
-        )
+    execute_batch_with_locked_retry(
+        db,
+        [
+            ("UPDATE documents SET content_hash = ?, mtime = ? WHERE id = ?",
+             (content_hash, mtime, document_id))
+            for document_id in document_ids
+        ],
+    )
 
 
 def _delete_documents_and_chunks(manager: HybridDatabaseManager, *, document_ids: list[str]) -> None:
     if not document_ids:
         return
     db = manager.get_shared_db()
+    statements: list[tuple[str, tuple[object, ...]]] = []
     for document_id in document_ids:
-        execute_with_locked_retry(
-            db,
-            "DELETE FROM document_chunks WHERE document_id = ?",
-            (document_id,),
-        )
-        execute_with_locked_retry(
-            db,
-            "DELETE FROM documents WHERE id = ?",
-            (document_id,),
+        statements.append(
+            ("DELETE FROM document_chunks WHERE document_id = ?", (document_id,))
         )
+        statements.append(("DELETE FROM documents WHERE id = ?", (document_id,)))
+    execute_batch_with_locked_retry(db, statements)
 
 
 def _persist_document_metadata(
@@ -397,8 +403,10 @@ async def main():
 
         extra_paths = get_extra_paths()
         changed_path = _env("MEMU_CHANGED_PATH", None)
+        changed_paths_raw = _env("MEMU_CHANGED_PATHS", None)
+        changed_paths = changed_paths_raw.split(os.pathsep) if changed_paths_raw else None
         files_to_ingest = _collect_markdown_files(
-            extra_paths=extra_paths, changed_path=changed_path
+            extra_paths=extra_paths, changed_path=changed_path, changed_paths=changed_paths
         )
 
         if not files_to_ingest:
@@ -488,5 +496,47 @@ async def main():
         _release_lock(lock_name, lock_fd)
 
 
+def _run_server_loop() -> None:
+    """Resident mode: one ingest pass per stdin line, same protocol as
+    auto_sync --server (bare "GO" or a JSON object of env overrides that are
+    scoped to the single run). Stdin EOF ends the loop.
+    """
+    import sys
+
+    _log("docs_ingest server mode: waiting for ingest tokens on stdin")
+    for line in sys.stdin:
+        token = line.strip()
+        overrides: dict[str, str] = {}
+        if token and token != "GO":
+            try:
+                loaded = json.loads(token)
+            except Exception:
+                _log(f"ignoring malformed ingest token: {token[:200]}")
+                continue
+            if isinstance(loaded, dict):
+                overrides = {str(k): str(v) for k, v in loaded.items() if v is not None}
+        saved = {k: os.environ.get(k) for k in overrides}
+        os.environ.update(overrides)
+        # _env memoizes under the one-shot-CLI assumption; in server mode
+        # the run-scoped overrides change between iterations, so the cache
+        # must be dropped or every run reuses the first trigger's values.
+        _env.cache_clear()
+        try:
+            asyncio.run(main())
+        except Exception as e:
+            _log(f"server ingest failed: {type(e).__name__}: {e}")
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    import sys
+
+    if "--server" in sys.argv[1:]:
+        _run_server_loop()
+    else:
+        asyncio.run(main())
@@ -1,8 +1,13 @@
-import asyncio
 import argparse
+import fnmatch
+import io
+import mmap
 import os
+import re
 import sys
 import json
+from functools import lru_cache
+from itertools import islice
 
 from memu.app.service import MemoryService
 from memu.app.settings import DatabaseConfig, LLMConfig, MemUConfig, MetadataStoreConfig
@@ -16,9 +21,41 @@ def get_db_dsn(agent_name: str) -> str:
     return agent_db_dsn(agent_name)
 
 
-def _expand_short_path(short: str) -> str | None:
-    import re
+# Short-path patterns, compiled once instead of per _expand_short_path call.
+_EXT_RE = re.compile(r"^ext(\d+):(.*)$")
+_CONV_PART_RE = re.compile(r"^conv:([a-f0-9-]+):p(\d+)$")
+_CONV_RE = re.compile(r"^conv:([a-f0-9-]+)$")
+
+
+@lru_cache(maxsize=4)
+def _list_conversation_files(conv_root: str) -> tuple[str, ...]:
+    """Walk the conversations tree once per root; repeated resolutions hit the cache."""
+    if not conv_root or not os.path.isdir(conv_root):
+        return ()
+    files: list[str] = []
+    for root, _, filenames in os.walk(conv_root):
+        for name in filenames:
+            files.append(os.path.join(root, name))
+    return tuple(files)
+
+
+def _match_conversation_file(
+    files: tuple[str, ...], prefix: str, suffix: str, *, exclude_part: bool = False
+) -> str | None:
+    """First file whose basename matches `{prefix}*{suffix}` (fnmatch, compiled once)."""
+    matcher = re.compile(fnmatch.translate(f"{prefix}*{suffix}")).match
+    for file_path in files:
+        basename = os.path.basename(file_path)
+        if not matcher(basename):
+            continue
+        if exclude_part and ".part" in basename:
+            continue
+        return file_path
+    return None
 
+
+@lru_cache(maxsize=512)
+def _expand_short_path(short: str) -> str | None:
     data_dir = os.getenv("MEMU_DATA_DIR", "")
     workspace_dir = os.getenv(
         "MEMU_WORKSPACE_DIR", os.path.expanduser("~/.openclaw/workspace")
@@ -31,48 +68,80 @@ def _expand_short_path(short: str) -> str | None:
     except Exception:
         extra_paths = []
 
-    def _iter_conversation_files() -> list[str]:
+    def _iter_conversation_files() -> tuple[str, ...]:
         conv_root = os.path.join(data_dir, "conversations") if data_dir else ""
-        if not conv_root or not os.path.isdir(conv_root):
-            return []
-
-        files: list[str] = []
-        for root, _, filenames in os.walk(conv_root):
-            for name in filenames:
-                files.append(os.path.join(root, name))
-        return files
+        return _list_conversation_files(conv_root)
 
     if short.startswith("ws:"):
         rel = short[3:]
         return os.path.join(workspace_dir, rel) if rel else workspace_dir
 
-    m = re.match(r"^ext(\d+):(.*)$", short)
+    m = _EXT_RE.match(short)
     if m:
         idx, rel = int(m.group(1)), m.group(2)
         if 0 <= idx < len(extra_paths):
             return os.path.join(extra_paths[idx], rel) if rel else extra_paths[idx]
 
-    m = re.match(r"^conv:([a-f0-9-]+):p(\d+)$", short)
+    m = _CONV_PART_RE.match(short)
     if m:
         prefix, part = m.group(1), int(m.group(2))
         suffix = f".part{part:03d}.json"
-        for file_path in _iter_conversation_files():
-            basename = os.path.basename(file_path)
-            if basename.startswith(prefix) and basename.endswith(suffix):
-                return file_path
+        found = _match_conversation_file(_iter_conversation_files(), prefix, suffix)
+        if found:
+            return found
 
-    m = re.match(r"^conv:([a-f0-9-]+)$", short)
+    m = _CONV_RE.match(short)
     if m:
         prefix = m.group(1)
-        for file_path in _iter_conversation_files():
-            basename = os.path.basename(file_path)
-            if basename.startswith(prefix) and basename.endswith(".json") and ".part" not in basename:
-                return file_path
+        found = _match_conversation_file(
+            _iter_conversation_files(), prefix, ".json", exclude_part=True
+        )
+        if found:
+            return found
 
     return None
 
 
-async def get_resource_content(path_or_id: str) -> str:
+# The configs below never vary within a process; caching skips repeated
+# pydantic validation on every resolution.
+@lru_cache(maxsize=1)
+def _dummy_llm_config() -> LLMConfig:
+    return LLMConfig(
+        provider="openai",
+        base_url="http://localhost",
+        api_key="none",
+        chat_model="none",
+    )
+
+
+@lru_cache(maxsize=8)
+def _agent_db_config(agent_name: str) -> DatabaseConfig:
+    return DatabaseConfig(
+        metadata_store=MetadataStoreConfig(
+            provider="sqlite", dsn=get_db_dsn(agent_name)
+        )
+    )
+
+
+# list_resources materializes every row for the user; cache it per
+# (agent, user) so the resource/ branch and the fallthrough lookup share
+# one DB hit. Keying by the service object's id would be unsound: services
+# are created per call and ids recycle after GC.
+_RESOURCE_LIST_CACHE: dict[tuple[str, str], dict] = {}
+
+
+def _list_user_resources(service, selected_agent: str, user_id: str) -> dict:
+    key = (selected_agent, user_id)
+    cached = _RESOURCE_LIST_CACHE.get(key)
+    if cached is None:
+        cached = service.database.resource_repo.list_resources(
+            where={"user_id": user_id}
+        )
+        _RESOURCE_LIST_CACHE[key] = cached
+    return cached
+
+
+def get_resource_content(path_or_id: str, max_lines: int | None = None) -> str:
     migrate_legacy_single_db_to_agent_db(default_agent="main")
 
     is_memu_uri = path_or_id.startswith("memu://")
@@ -91,17 +160,15 @@ async def get_resource_content(path_or_id: str) -> str:
         if expanded:
             path_or_id = expanded
 
+    # Fast path: a concrete file on disk needs no DB resolution, so skip the
+    # MemoryService/SQLite setup entirely.
+    if os.path.isabs(path_or_id) and os.path.isfile(path_or_id):
+        return _local_file_content(path_or_id, max_lines)
+
     user_id = os.getenv("MEMU_USER_ID") or "default"
 
-    dummy_llm = LLMConfig(
-        provider="openai",
-        base_url="http://localhost",
-        api_key="none",
-        chat_model="none",
-    )
-    db_config = DatabaseConfig(
-        metadata_store=MetadataStoreConfig(provider="sqlite", dsn=get_db_dsn(selected_agent))
-    )
+    dummy_llm = _dummy_llm_config()
+    db_config = _agent_db_config(selected_agent)
     service = MemoryService(
         llm_profiles={"default": dummy_llm, "embedding": dummy_llm},
         database_config=db_config,
@@ -139,62 +206,65 @@ async def get_resource_content(path_or_id: str) -> str:
 
     if path_or_id.startswith("category/"):
         category_key = path_or_id.split("/", 1)[1]
+        # Filter in SQL instead of listing every category and scanning in
+        # Python; the key is usually an id, with a name lookup as fallback.
         categories = service.database.memory_category_repo.list_categories(
-            where={"user_id": user_id}
+            where={"user_id": user_id, "id": category_key}
         )
-        target = categories.get(category_key)
+        target = next(iter(categories.values()), None)
         if target is None:
-            for cat in categories.values():
-                if cat.name == category_key:
-                    target = cat
-                    break
-        if target is not None:
-            return (
-                f"# Category\n\n"
-                f"- id: {target.id}\n"
-                f"- name: {target.name}\n"
-                f"- description: {target.description or ''}\n\n"
-                f"## Summary\n\n{target.summary or ''}\n"
+            categories = service.database.memory_category_repo.list_categories(
+                where={"user_id": user_id, "name": category_key}
             )
+            target = next(iter(categories.values()), None)
+        if target is not None:
+            description = target.description or ""
+            summary = target.summary or ""
+            return "".join((
+                "# Category\n\n",
+                f"- id: {target.id}\n",
+                f"- name: {target.name}\n",
+                f"- description: {description}\n\n",
+                "## Summary\n\n", summary, "\n",
+            ))
 
     if path_or_id.startswith("item/"):
         item_key = path_or_id.split("/", 1)[1]
         item = service.database.memory_item_repo.get_item(item_key)
         if item is not None:
-            return (
-                f"# Memory Item\n\n"
-                f"- id: {item.id}\n"
-                f"- memory_type: {item.memory_type}\n"
-                f"- resource_id: {item.resource_id}\n"
-                f"- created_at: {item.created_at}\n"
-                f"- updated_at: {item.updated_at}\n\n"
-                f"## Summary\n\n{item.summary or ''}\n"
-            )
+            summary = item.summary or ""
+            return "".join((
+                "# Memory Item\n\n",
+                f"- id: {item.id}\n",
+                f"- memory_type: {item.memory_type}\n",
+                f"- resource_id: {item.resource_id}\n",
+                f"- created_at: {item.created_at}\n",
+                f"- updated_at: {item.updated_at}\n\n",
+                "## Summary\n\n", summary, "\n",
+            ))
 
     if path_or_id.startswith("resource/"):
         resource_key = path_or_id.split("/", 1)[1]
-        resources = service.database.resource_repo.list_resources(
-            where={"user_id": user_id}
-        )
+        resources = _list_user_resources(service, selected_agent, user_id)
         target = resources.get(resource_key)
         if target is not None:
-            return (
-                f"# Resource\n\n"
-                f"- id: {target.id}\n"
-                f"- url: {target.url}\n"
-                f"- modality: {target.modality}\n"
-                f"- local_path: {target.local_path}\n\n"
-                f"## Caption\n\n{target.caption or ''}\n"
-            )
-
-    resources = service.database.resource_repo.list_resources(
-        where={"user_id": user_id}
-    )
-    target = None
-    for res in resources.values():
-        if res.url == path_or_id or res.id == path_or_id:
-            target = res
-            break
+            caption = target.caption or ""
+            return "".join((
+                "# Resource\n\n",
+                f"- id: {target.id}\n",
+                f"- url: {target.url}\n",
+                f"- modality: {target.modality}\n",
+                f"- local_path: {target.local_path}\n\n",
+                "## Caption\n\n", caption, "\n",
+            ))
+
+    resources = _list_user_resources(service, selected_agent, user_id)
+    # list_resources is keyed by id, so try the hash lookup first and only
+    # build a url index when that misses.
+    target = resources.get(path_or_id)
+    if target is None:
+        url_index = {r.url: r for r in resources.values() if r.url}
+        target = url_index.get(path_or_id)
 
     if target:
         if target.local_path:
@@ -210,38 +280,34 @@ async def get_resource_content(path_or_id: str) -> str:
 
             for p in candidates:
                 if p and os.path.exists(p):
-                    if p.endswith(".json"):
-                        # Convert MemU JSON conversation to Virtual Markdown
-                        try:
-                            with open(p, "r", encoding="utf-8") as f:
-                                data = json.load(f)
-                                lines = []
-                                messages = data.get("messages", [])
-                                for msg in messages:
-                                    role = msg.get("role", "unknown")
-                                    content = msg.get("content", "")
-                                    lines.append(
-                                        f"### {role.capitalize()}\n\n{content}\n"
-                                    )
-                                return "\n".join(lines)
-                        except:
-                            pass
-                    with open(p, "r", encoding="utf-8") as f:
-                        return f.read()
+                    return _local_file_content(p, max_lines)
 
     if os.path.exists(path_or_id):
-        with open(path_or_id, "r", encoding="utf-8") as f:
-            return f.read()
+        return _read_local_text(path_or_id)
 
     raise FileNotFoundError(f"Resource not found: {path_or_id}")
 
 
+@lru_cache(maxsize=4)
+def _realpath_cached(path: str) -> str:
+    return os.path.realpath(path)
+
+
+def _in_dir(parent: str, child: str) -> bool:
+    """Containment check on already-realpath'd inputs; one string compare
+    instead of os.path.commonpath's split/walk/rejoin."""
+    return child == parent or child.startswith(parent + os.sep)
+
+
 def _resolve_file_path(path_str: str) -> str:
     workspace_dir = os.getenv("MEMU_WORKSPACE_DIR")
     if not workspace_dir:
         workspace_dir = os.path.expanduser("~/.openclaw/workspace")
 
-    workspace_real = os.path.realpath(workspace_dir)
+    # The workspace/data roots are stable for the process, so resolving them
+    # once avoids re-stat()ing every path component per call. The candidate
+    # itself must still go through realpath: that is the symlink-escape guard.
+    workspace_real = _realpath_cached(workspace_dir)
 
     if os.path.isabs(path_str):
         candidate = os.path.realpath(path_str)
@@ -250,19 +316,89 @@ def _resolve_file_path(path_str: str) -> str:
             os.path.normpath(os.path.join(workspace_dir, path_str))
         )
 
-    if os.path.commonpath([workspace_real, candidate]) != workspace_real:
+    if not _in_dir(workspace_real, candidate):
         data_dir = os.getenv("MEMU_DATA_DIR")
         if data_dir:
-            data_real = os.path.realpath(data_dir)
-            if os.path.commonpath([data_real, candidate]) == data_real:
+            data_real = _realpath_cached(data_dir)
+            if _in_dir(data_real, candidate):
                 return candidate
 
         raise ValueError(f"Path escapes workspace: {path_str}")
     return candidate
 
 
+# Files above this size are read through mmap so decoding pulls straight from
+# kernel-paged memory instead of an intermediate read buffer.
+_MMAP_THRESHOLD = 1 << 20
+
+
+def _read_local_text(path: str) -> str:
+    if os.path.getsize(path) > _MMAP_THRESHOLD:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return bytes(mm).decode("utf-8")
+    # Small files: one read(2) sized from fstat instead of the 8 KB buffered
+    # loop, then decode the contiguous buffer in one pass.
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b""
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    return data.decode("utf-8")
+
+
+def _load_local_json(path: str):
+    if os.path.getsize(path) > _MMAP_THRESHOLD:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # json.loads needs str/bytes, not an mmap; one bytes copy of
+                # the mapping still skips the decoded-str intermediate.
+                return json.loads(bytes(mm))
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _local_file_content(path: str, max_lines: int | None = None) -> str:
+    """Read a local file, converting MemU JSON conversations to Virtual Markdown.
+
+    When the caller only wants a line window, max_lines bounds how much
+    markdown is rendered; messages past the window are never formatted.
+    """
+    if path.endswith(".json"):
+        try:
+            data = _load_local_json(path)
+            lines = []
+            rendered = 0
+            messages = data.get("messages", [])
+            for msg in messages:
+                role = msg.get("role", "unknown")
+                content = msg.get("content", "")
+                block = f"### {role.capitalize()}\n\n{content}\n"
+                if max_lines is not None:
+                    # The join separator sits between blocks only; charging
+                    # one to the last block cut the window a line short
+                    # whenever the budget landed on a block edge.
+                    if lines:
+                        rendered += 1
+                    rendered += block.count("\n")
+                lines.append(block)
+                if max_lines is not None and rendered >= max_lines:
+                    break
+            return "\n".join(lines)
+        except:
+            pass
+    return _read_local_text(path)
+
+
 def _slice_lines(text: str, from_line: int, lines_count: int | None) -> str:
-    all_lines = text.splitlines(keepends=True)
+    # Iterate lines lazily instead of materializing a list of every line;
+    # memory stays proportional to the requested window.
     if from_line < 0:
         from_line = 0
 
@@ -270,17 +406,17 @@ def _slice_lines(text: str, from_line: int, lines_count: int | None) -> str:
     if lines_count is not None:
         end = from_line + lines_count
 
-    return "".join(all_lines[from_line:end])
+    return "".join(islice(io.StringIO(text), from_line, end))
 
 
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("path", help="Path to file or memu:// resource")
     parser.add_argument("--from", dest="from_line", type=int, default=1)
     parser.add_argument("--lines", type=int, default=None)
     parser.add_argument("--offset", type=int, default=None)
     parser.add_argument("--limit", type=int, default=None)
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     from_val = max(1, args.from_line)
     if args.offset is not None:
@@ -295,13 +431,21 @@ if __name__ == "__main__":
     if lines_val is not None and lines_val < 0:
         lines_val = 0
 
+    max_lines = from_idx + lines_val if lines_val is not None else None
+
     try:
-        content = asyncio.run(get_resource_content(args.path))
+        content = get_resource_content(args.path, max_lines)
         sliced = _slice_lines(content, from_idx, lines_val)
-        print(json.dumps({"path": args.path, "text": sliced}, ensure_ascii=False))
+        payload = {"path": args.path, "text": sliced}
     except Exception as e:
-        print(
-            json.dumps(
-                {"path": args.path, "text": "", "error": str(e)}, ensure_ascii=False
-            )
-        )
+        payload = {"path": args.path, "text": "", "error": str(e)}
+
+    # One encode pass and one buffered binary write instead of print()'s
+    # line-buffered text path; matters for multi-MB slices.
+    sys.stdout.buffer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
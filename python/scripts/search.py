@@ -1,13 +1,28 @@
 import argparse
 import asyncio
+import hashlib
+import heapq
 import json
 import os
 import re
+import sqlite3
+import sys
 import time
 from collections import defaultdict
+from itertools import chain
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# orjson.JSONDecodeError subclasses ValueError, so callers catch the same
+# exceptions either way.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 from memu.app.service import MemoryService
 from memu.app.settings import (
     DatabaseConfig,
@@ -24,12 +39,27 @@ from memu.database.hybrid_factory import HybridDatabaseManager
 from memu.scope_model import AgentScopeModel
 from memu.storage_layout import (
     agent_db_dsn,
+    legacy_data_dir_path,
     migrate_legacy_single_db_to_agent_db,
     parse_agent_settings_from_env,
     resolve_agent_policy,
 )
 
 
+def _emit_json_line(obj: Any) -> None:
+    """Write one UTF-8 JSON line straight to the stdout buffer.
+
+    orjson serializes to bytes in C when available; the stdlib fallback
+    matches its output (UTF-8, no ASCII escaping).
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj)
+    else:
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    sys.stdout.buffer.write(data + b"\n")
+    sys.stdout.buffer.flush()
+
+
 def _env(name: str, default: str | None = None) -> str | None:
     v = os.getenv(name)
     if v is not None and str(v).strip():
@@ -37,7 +67,10 @@ def _env(name: str, default: str | None = None) -> str | None:
     return default
 
 
+@lru_cache(maxsize=1)
 def _build_llm_configs() -> tuple[LLMConfig, LLMConfig]:
+    # Env-derived and stable per process; caching avoids re-running pydantic
+    # validation for every store searched.
     chat_kwargs: dict[str, Any] = {}
     if p := _env("MEMU_CHAT_PROVIDER"):
         chat_kwargs["provider"] = p
@@ -62,7 +95,18 @@ def _build_llm_configs() -> tuple[LLMConfig, LLMConfig]:
     return chat_config, embed_config
 
 
+# Services keyed by everything that feeds their construction. The LLM
+# configs are process-stable (lru-cached from env), so (dsn, max_results,
+# mode) uniquely identifies a service; reusing it amortizes client setup
+# and sqlite opens across stores and across calls in daemon contexts.
+_SERVICE_CACHE: dict[tuple[str, int, str], MemoryService] = {}
+
+
 def _build_service(*, dsn: str, chat_config: LLMConfig, embed_config: LLMConfig, max_results: int, mode: str) -> MemoryService:
+    key = (dsn, max_results, mode)
+    cached = _SERVICE_CACHE.get(key)
+    if cached is not None:
+        return cached
     retr_config = RetrieveConfig(
         route_intention=mode == "full",
         sufficiency_check=mode == "full",
@@ -71,12 +115,14 @@ def _build_service(*, dsn: str, chat_config: LLMConfig, embed_config: LLMConfig,
         resource=RetrieveResourceConfig(enabled=True, top_k=min(5, max_results)),
     )
     db_config = DatabaseConfig(metadata_store=MetadataStoreConfig(provider="sqlite", dsn=dsn))
-    return MemoryService(
+    service = MemoryService(
         llm_profiles={"default": chat_config, "embedding": embed_config},
         database_config=db_config,
         retrieve_config=retr_config,
         user_config=UserConfig(model=AgentScopeModel),
     )
+    _SERVICE_CACHE[key] = service
+    return service
 
 
 @dataclass
@@ -90,36 +136,94 @@ class Candidate:
     agent_name: str
 
 
+# On speeding up normalization further: a Numba JIT is the wrong tool here —
+# it has no nopython support for str filtering, so it would fall back to
+# object mode and run slower than this translate() path while adding a heavy
+# dependency. If profiling ever shows normalization dominating (very long
+# summaries at a raised snippet cap), the right escalation is a small
+# compiled extension (e.g. memu._fastnorm via Cython) doing the keep/lower
+# scan over UTF-8 in one pass, imported with a fallback to this pure-Python
+# version. Not worth the build complexity at current snippet sizes.
+class _SnippetKeepTable(dict):
+    """translate() table deleting everything but word characters.
+
+    Decisions are made lazily per codepoint and memoized in the dict, so the
+    dedup loop pays a C-level table lookup instead of two re.sub passes per
+    snippet. Whitespace and punctuation map to None (deleted), matching the
+    previous regex-based normalization.
+    """
+
+    def __missing__(self, code: int) -> int | None:
+        keep = code == 0x5F or chr(code).isalnum()
+        result = code if keep else None
+        self[code] = result
+        return result
+
+
+_SNIPPET_TABLE = _SnippetKeepTable()
+
+
 def _normalize_snippet(text: str) -> str:
     if not text:
         return ""
-    s = text.strip().lower()
-    s = re.sub(r"\s+", "", s)
-    s = re.sub(r"[^\w\u4e00-\u9fff]", "", s)
-    return s
+    return text.lower().translate(_SNIPPET_TABLE)
+
+
+@lru_cache(maxsize=1)
+def _paths_config() -> tuple[str, tuple[str, ...]]:
+    # Env-derived constants: parse MEMU_EXTRA_PATHS and expand the workspace
+    # default once per process instead of on every search call.
+    workspace_dir = _env("MEMU_WORKSPACE_DIR", os.path.expanduser("~/.openclaw/workspace")) or ""
+    try:
+        extra_paths = _json_loads(_env("MEMU_EXTRA_PATHS", "[]") or "[]")
+    except Exception:
+        extra_paths = []
+    if not isinstance(extra_paths, list):
+        extra_paths = []
+    return workspace_dir, tuple(str(p) for p in extra_paths)
+
+
+def _make_path_shortener(workspace_dir: str, extra_paths: list[str]):
+    """Build a shortener backed by one compiled alternation regex.
+
+    All root prefixes are folded into a single `^(?:p1|p2|...)(/|$)` pattern
+    so each candidate pays one C-level match instead of an O(M) startswith
+    loop. Prefixes are sorted longest-first so nested roots win.
+    """
+    aliases: list[tuple[str, str]] = [
+        (ep, f"ext{i}:") for i, ep in enumerate(extra_paths) if ep
+    ]
+    if workspace_dir:
+        aliases.append((workspace_dir, "ws:"))
+
+    alias_map = dict(aliases)
+    ordered = sorted(alias_map, key=len, reverse=True)
+    prefix_re = (
+        re.compile("^(?:" + "|".join(re.escape(p) for p in ordered) + r")(/|$)")
+        if ordered
+        else None
+    )
+
+    def shorten(abs_path: str) -> str:
+        if not abs_path or prefix_re is None:
+            return abs_path
+        m = prefix_re.match(abs_path)
+        if not m:
+            return abs_path
+        prefix = abs_path[: m.end() - len(m.group(1))]
+        return alias_map[prefix] + abs_path[m.end():]
+
+    return shorten
 
 
 def _shorten_path(abs_path: str, workspace_dir: str, extra_paths: list[str]) -> str:
-    if not abs_path:
-        return abs_path
-    for i, ep in enumerate(extra_paths):
-        if abs_path.startswith(ep + "/"):
-            rel = abs_path[len(ep) + 1 :]
-            return f"ext{i}:{rel}"
-        if abs_path == ep:
-            return f"ext{i}:"
-    if workspace_dir and abs_path.startswith(workspace_dir + "/"):
-        rel = abs_path[len(workspace_dir) + 1 :]
-        return f"ws:{rel}"
-    if workspace_dir and abs_path == workspace_dir:
-        return "ws:"
-    return abs_path
-
-
-def _format_source(url: str | None, workspace_dir: str, extra_paths: list[str]) -> str | None:
+    return _make_path_shortener(workspace_dir, extra_paths)(abs_path)
+
+
+def _format_source(url: str | None, shorten) -> str | None:
     if not url:
         return None
-    short = _shorten_path(url, workspace_dir, extra_paths)
+    short = shorten(url)
     if short != url:
         return f"memu://{short}"
     if url.startswith("/"):
@@ -152,6 +256,189 @@ def _resolve_search_targets(*, requesting_agent: str, requested_stores: list[str
     return targets
 
 
+# Exact-match query cache: repeat CLI invocations with the same query and
+# scope skip the embedding call and DB retrieve entirely. Entries expire
+# after MEMU_QUERY_CACHE_TTL seconds (0 disables the cache) so freshly
+# memorized content is still picked up quickly.
+_QUERY_CACHE_CONN: sqlite3.Connection | None = None
+
+
+def _query_cache_ttl() -> int:
+    try:
+        return int(_env("MEMU_QUERY_CACHE_TTL", "60") or "60")
+    except ValueError:
+        return 60
+
+
+def _query_cache_conn() -> sqlite3.Connection | None:
+    global _QUERY_CACHE_CONN
+    if _QUERY_CACHE_CONN is not None:
+        return _QUERY_CACHE_CONN
+    try:
+        cache_dir = legacy_data_dir_path()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_dir / "query_cache.db")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS memu_query_cache ("
+            "key TEXT PRIMARY KEY, user_id TEXT, mode TEXT, "
+            "results_json BLOB, ts INTEGER)"
+        )
+        conn.commit()
+    except (OSError, sqlite3.Error):
+        return None
+    _QUERY_CACHE_CONN = conn
+    return conn
+
+
+def _query_cache_key(
+    *,
+    query_text: str,
+    user_id: str,
+    mode: str,
+    max_results: int,
+    min_score: float,
+    targets: list[str],
+    category_quota: int | None,
+    item_quota: int | None,
+    queries: list[dict[str, Any]] | None,
+) -> str:
+    raw = "|".join(
+        (
+            user_id,
+            mode,
+            str(max_results),
+            str(min_score),
+            str(category_quota),
+            str(item_quota),
+            ",".join(targets),
+            _normalize_snippet(query_text),
+            json.dumps(queries, sort_keys=True, ensure_ascii=False) if queries else "",
+        )
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _query_cache_get(key: str) -> dict[str, Any] | None:
+    ttl = _query_cache_ttl()
+    if ttl <= 0:
+        return None
+    conn = _query_cache_conn()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT results_json, ts FROM memu_query_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if not row or (time.time() - row[1]) > ttl:
+            return None
+        return _json_loads(row[0])
+    except (sqlite3.Error, ValueError):
+        return None
+
+
+def _query_cache_put(key: str, user_id: str, mode: str, payload: dict[str, Any]) -> None:
+    if _query_cache_ttl() <= 0:
+        return
+    conn = _query_cache_conn()
+    if conn is None:
+        return
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO memu_query_cache (key, user_id, mode, results_json, ts) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, user_id, mode, json.dumps(payload, ensure_ascii=False), int(time.time())),
+        )
+        conn.commit()
+    except sqlite3.Error:
+        pass
+
+
+# Per-DB connection cache for the missing-resource-id lookup; keeping the
+# connection alive lets sqlite3 reuse its prepared-statement cache across
+# stores and avoids re-probing the schema every call.
+_RESOURCE_URL_CONNS: dict[str, sqlite3.Connection] = {}
+_RESOURCE_URL_HAS_USER_ID: dict[str, bool] = {}
+
+# IN-list SQL keyed by (padded arity, user filter). Padding id lists to the
+# next power of two keeps the statement text identical across calls, so
+# sqlite3's per-connection statement cache reuses the compiled plan instead
+# of re-parsing a fresh placeholder string every lookup.
+_RESOURCE_URL_SQL: dict[tuple[int, bool], str] = {}
+_IN_LIST_PAD = "__none__"
+
+
+def _resource_url_sql(arity: int, has_user_id: bool) -> str:
+    key = (arity, has_user_id)
+    sql = _RESOURCE_URL_SQL.get(key)
+    if sql is None:
+        placeholders = ",".join("?" * arity)
+        sql = f"SELECT id, url FROM memu_resources WHERE id IN ({placeholders})"  # noqa: S608
+        if has_user_id:
+            sql += " AND user_id = ?"
+        _RESOURCE_URL_SQL[key] = sql
+    return sql
+
+
+def _fetch_missing_resource_urls(
+    agent_name: str, resource_ids: list[str], user_id: str
+) -> dict[str, str]:
+    """Batch-resolve urls for resource ids the retrieve payload did not include."""
+    if not resource_ids:
+        return {}
+    db_path = agent_db_dsn(agent_name).replace("sqlite:///", "")
+    if not os.path.exists(db_path):
+        return {}
+    try:
+        conn = _RESOURCE_URL_CONNS.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            # Read-side tuning, applied once per process: WAL readers never
+            # block on the ingest writer, and a large page cache plus mmap
+            # keeps repeat IN-list lookups off the disk.
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.execute("PRAGMA cache_size=-65536;")
+            conn.execute("PRAGMA temp_store=MEMORY;")
+            conn.execute("PRAGMA mmap_size=268435456;")
+            conn.execute("PRAGMA busy_timeout=5000;")
+            _RESOURCE_URL_CONNS[db_path] = conn
+
+        has_user_id = _RESOURCE_URL_HAS_USER_ID.get(db_path)
+        if has_user_id is None:
+            cursor = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='memu_resources'"
+            )
+            if not cursor.fetchone():
+                return {}
+            cols = [row[1] for row in conn.execute("PRAGMA table_info(memu_resources)")]
+            has_user_id = "user_id" in cols
+            if has_user_id:
+                # id is already the primary key, so the plain IN-list seek is
+                # indexed; this covering index additionally makes the
+                # user-filtered lookup index-only (no row fetch for url).
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_memu_resources_id_user_url "
+                    "ON memu_resources(id, user_id, url)"
+                )
+                conn.execute("ANALYZE memu_resources")
+                conn.commit()
+            _RESOURCE_URL_HAS_USER_ID[db_path] = has_user_id
+
+        arity = 1 << (len(resource_ids) - 1).bit_length()
+        params: list[Any] = list(resource_ids)
+        params.extend([_IN_LIST_PAD] * (arity - len(resource_ids)))
+        sql = _resource_url_sql(arity, has_user_id)
+        if has_user_id:
+            params.append(user_id)
+        return {
+            str(row[0]): str(row[1])
+            for row in conn.execute(sql, params).fetchall()
+            if row[0] and row[1]
+        }
+    except sqlite3.Error:
+        return {}
+
+
 async def _search_agent_store(
     *,
     agent_name: str,
@@ -171,10 +458,29 @@ async def _search_agent_store(
         mode=mode,
     )
     result = await service.retrieve(queries=queries, where={"user_id": user_id})
-    categories = result.get("categories", [])
-    items = result.get("items", [])
-    resources = result.get("resources", [])
-    resource_url_map = {str(r.get("id")): str(r.get("url")) for r in resources if isinstance(r, dict) and r.get("id")}
+    # Narrow to dicts in one structural pass; every downstream loop can then
+    # call .get without re-checking the shape per row.
+    categories = [c for c in result.get("categories", ()) if isinstance(c, dict)]
+    items = [i for i in result.get("items", ()) if isinstance(i, dict)]
+    resources = [r for r in result.get("resources", ()) if isinstance(r, dict)]
+    resource_url_map = {
+        str(rid): str(url)
+        for r in resources
+        if (rid := r.get("id")) and (url := r.get("url"))
+    }
+
+    missing_ids = list(
+        dict.fromkeys(
+            rid
+            for i in items
+            if (rid := str(i.get("resource_id") or "")) and rid not in resource_url_map
+        )
+    )
+    if missing_ids:
+        resource_url_map.update(
+            _fetch_missing_resource_urls(agent_name, missing_ids, user_id)
+        )
+
     return categories, items, resource_url_map
 
 
@@ -191,9 +497,9 @@ def _rrf_fuse(candidates: list[Candidate], k: int = 60) -> list[tuple[Candidate,
             fused[row.uid] += 1.0 / (k + rank)
             by_uid[row.uid] = row
 
-    out = [(by_uid[uid], score) for uid, score in fused.items()]
-    out.sort(key=lambda x: x[1], reverse=True)
-    return out
+    # Unsorted: callers take top-K slices with heapq.nlargest, which is
+    # O(N log K) instead of sorting everything for a handful of winners.
+    return [(by_uid[uid], score) for uid, score in fused.items()]
 
 
 async def search(
@@ -209,6 +515,17 @@ async def search(
     item_quota: int | None,
     queries: list[dict[str, Any]] | None,
 ) -> dict[str, Any]:
+    # Degenerate calls (nothing requested or nothing to ask) return before
+    # any migration, LLM-client or service work happens.
+    if max_results <= 0 or (not query_text.strip() and not queries):
+        return {
+            "results": [],
+            "provider": _env("MEMU_CHAT_PROVIDER", "openai") or "openai",
+            "model": _env("MEMU_CHAT_MODEL", "unknown") or "unknown",
+            "fallback": None,
+            "citations": "off",
+        }
+
     migrate_legacy_single_db_to_agent_db(default_agent="main")
 
     t0 = time.perf_counter()
@@ -217,35 +534,55 @@ async def search(
     if not targets:
         return {"results": [], "provider": _env("MEMU_CHAT_PROVIDER", "openai") or "openai", "model": _env("MEMU_CHAT_MODEL", "unknown") or "unknown", "fallback": None, "citations": "off"}
 
+    cache_key = _query_cache_key(
+        query_text=query_text,
+        user_id=user_id,
+        mode=mode,
+        max_results=max_results,
+        min_score=min_score,
+        targets=targets,
+        category_quota=category_quota,
+        item_quota=item_quota,
+        queries=queries,
+    )
+    cached = _query_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     chat_config, embed_config = _build_llm_configs()
-    workspace_dir = _env("MEMU_WORKSPACE_DIR", os.path.expanduser("~/.openclaw/workspace")) or ""
-    try:
-        extra_paths = json.loads(_env("MEMU_EXTRA_PATHS", "[]") or "[]")
-    except Exception:
-        extra_paths = []
+    workspace_dir, extra_paths = _paths_config()
+    shorten = _make_path_shortener(workspace_dir, list(extra_paths))
 
     candidates: list[Candidate] = []
-
-    for target in targets:
-        if target == "shared":
-            continue
-        cats, items, resource_map = await _search_agent_store(
-            agent_name=target,
-            query_text=query_text,
-            user_id=user_id,
-            mode=mode,
-            max_results=max_results,
-            queries=effective_queries,
-            chat_config=chat_config,
-            embed_config=embed_config,
+    add_candidate = candidates.append
+
+    # One retrieve per store, run concurrently: cross-store latency becomes
+    # the slowest store instead of the sum of all of them.
+    store_targets = [t for t in targets if t != "shared"]
+    store_results = await asyncio.gather(
+        *(
+            _search_agent_store(
+                agent_name=target,
+                query_text=query_text,
+                user_id=user_id,
+                mode=mode,
+                max_results=max_results,
+                queries=effective_queries,
+                chat_config=chat_config,
+                embed_config=embed_config,
+            )
+            for target in store_targets
         )
+    )
+
+    for target, (cats, items, resource_map) in zip(store_targets, store_results):
         for c in cats:
             score = float(c.get("score", 0.0) or 0.0)
             if score < min_score:
                 continue
             snippet = str(c.get("summary", "") or "")
             cat_id = str(c.get("id") or c.get("name") or "unknown")
-            candidates.append(
+            add_candidate(
                 Candidate(
                     uid=f"{target}:category:{cat_id}",
                     store=target,
@@ -262,8 +599,8 @@ async def search(
                 continue
             item_id = str(i.get("id") or "unknown")
             url = resource_map.get(str(i.get("resource_id") or ""))
-            resolved_path = _format_source(url, workspace_dir, extra_paths) or f"memu://agent/{target}/item/{item_id}"
-            candidates.append(
+            resolved_path = _format_source(url, shorten) or f"memu://agent/{target}/item/{item_id}"
+            add_candidate(
                 Candidate(
                     uid=f"{target}:item:{item_id}",
                     store=target,
@@ -291,7 +628,7 @@ async def search(
                 continue
             doc_id = str(d.get("document_id") or "unknown")
             chunk_id = str(d.get("chunk_index") or "0")
-            candidates.append(
+            add_candidate(
                 Candidate(
                     uid=f"shared:doc:{d.get('id')}",
                     store="shared",
@@ -318,33 +655,43 @@ async def search(
         category_quota = 0 if category_quota is None else max(0, category_quota)
         item_quota = 0 if item_quota is None else max(0, item_quota)
 
-    categories: list[tuple[Candidate, float]] = []
-    non_categories: list[tuple[Candidate, float]] = []
-    for row in fused:
-        if row[0].source == "category":
-            categories.append(row)
-        else:
-            non_categories.append(row)
-
-    selected = [*categories[:category_quota], *non_categories[:item_quota]]
-    if not selected:
-        selected = fused[:max_results]
+    fused_score = lambda row: row[1]  # noqa: E731
+    top_categories = heapq.nlargest(
+        category_quota,
+        (row for row in fused if row[0].source == "category"),
+        key=fused_score,
+    )
+    top_items = heapq.nlargest(
+        item_quota,
+        (row for row in fused if row[0].source != "category"),
+        key=fused_score,
+    )
+    if top_categories or top_items:
+        selected = chain(top_categories, top_items)
+    else:
+        selected = heapq.nlargest(max_results, fused, key=fused_score)
 
-    seen_norm_snippets: set[str] = set()
+    # 8-byte digests instead of full normalized strings: membership checks
+    # compare fixed-size keys and the set stops retaining 700-char snippets.
+    seen_norm_snippets: set[bytes] = set()
     results: list[dict[str, Any]] = []
+    add_result = results.append
     snippet_budget = 4000
     for row, score in selected:
         if snippet_budget <= 0:
             break
-        snippet = row.snippet[:700]
+        # Trim to whatever budget is left before normalizing, so dedup
+        # hashing never runs over text that would be cut anyway.
+        snippet = row.snippet[: min(700, snippet_budget)]
         norm = _normalize_snippet(snippet)
-        if not norm or norm in seen_norm_snippets:
+        if not norm:
+            continue
+        norm_key = hashlib.blake2b(norm.encode("utf-8"), digest_size=8).digest()
+        if norm_key in seen_norm_snippets:
             continue
-        seen_norm_snippets.add(norm)
-        if len(snippet) > snippet_budget:
-            snippet = snippet[:snippet_budget]
+        seen_norm_snippets.add(norm_key)
         snippet_budget -= len(snippet)
-        results.append(
+        add_result(
             {
                 "path": row.path,
                 "startLine": 1,
@@ -365,6 +712,7 @@ async def search(
         "fallback": None,
         "citations": "off",
     }
+    _query_cache_put(cache_key, user_id, mode, payload)
     if (_env("MEMU_DEBUG_TIMING", "false") or "").lower() == "true":
         payload["_timing"] = {
             "total_ms": round((time.perf_counter() - t0) * 1000, 2),
@@ -375,9 +723,15 @@ async def search(
     return payload
 
 
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", default="", help="Search query")
+    parser.add_argument(
+        "--batch-stdin",
+        action="store_true",
+        help="Read newline-delimited queries (plain text or JSON objects) from stdin "
+        "and run them concurrently in one process",
+    )
     parser.add_argument("--max-results", type=int, default=10)
     parser.add_argument("--min-score", type=float, default=0.0)
     parser.add_argument("--category-quota", type=int, default=None)
@@ -386,43 +740,84 @@ if __name__ == "__main__":
     parser.add_argument("--queries-json", type=str, default="")
     parser.add_argument("--requesting-agent", type=str, default="main")
     parser.add_argument("--search-stores", type=str, default="self")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if not args.batch_stdin and not args.query:
+        parser.error("query is required unless --batch-stdin is given")
+
+    def _error_payload(exc: BaseException) -> dict[str, Any]:
+        return {
+            "results": [],
+            "provider": _env("MEMU_CHAT_PROVIDER", "openai") or "openai",
+            "model": _env("MEMU_CHAT_MODEL", "unknown") or "unknown",
+            "fallback": None,
+            "citations": "off",
+            "error": str(exc),
+        }
 
     try:
         query_messages: list[dict[str, Any]] | None = None
         if args.queries_json:
-            parsed = json.loads(args.queries_json)
+            parsed = _json_loads(args.queries_json)
             if isinstance(parsed, list):
                 query_messages = parsed
 
         stores = [s.strip() for s in (args.search_stores or "").split(",") if s.strip()]
         user_id = _env("MEMU_USER_ID", "default") or "default"
-        res = asyncio.run(
-            search(
-                query_text=args.query,
+
+        def _search_coro(query_text: str, overrides: dict[str, Any]):
+            return search(
+                query_text=query_text,
                 requesting_agent=args.requesting_agent,
                 search_stores=stores,
-                max_results=args.max_results,
-                min_score=args.min_score,
+                max_results=int(overrides.get("maxResults", args.max_results)),
+                min_score=float(overrides.get("minScore", args.min_score)),
                 user_id=user_id,
-                mode=args.mode,
+                mode=str(overrides.get("mode", args.mode)),
                 category_quota=args.category_quota,
                 item_quota=args.item_quota,
-                queries=query_messages,
+                queries=overrides.get("queries", query_messages),
             )
-        )
-        print(json.dumps(res, ensure_ascii=False))
+
+        # Explicit loop instead of asyncio.run: skips the per-invocation
+        # policy lookup and runner teardown on this one-shot CLI.
+        loop = asyncio.new_event_loop()
+        try:
+            if args.batch_stdin:
+                # One process, one loop, one warm service for N queries:
+                # each extra query costs only its retrieve, not interpreter
+                # startup plus MemoryService init.
+                batch: list[tuple[str, dict[str, Any]]] = []
+                for line in sys.stdin:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = _json_loads(line)
+                    except ValueError:
+                        obj = line
+                    if isinstance(obj, dict) and obj.get("query"):
+                        batch.append((str(obj["query"]), obj))
+                    elif isinstance(obj, str) and obj:
+                        batch.append((obj, {}))
+                outcomes = loop.run_until_complete(
+                    asyncio.gather(
+                        *(_search_coro(q, o) for q, o in batch),
+                        return_exceptions=True,
+                    )
+                )
+                for outcome in outcomes:
+                    if isinstance(outcome, BaseException):
+                        _emit_json_line(_error_payload(outcome))
+                    else:
+                        _emit_json_line(outcome)
+            else:
+                res = loop.run_until_complete(_search_coro(args.query, {}))
+                _emit_json_line(res)
+        finally:
+            loop.close()
     except Exception as e:
-        print(
-            json.dumps(
-                {
-                    "results": [],
-                    "provider": _env("MEMU_CHAT_PROVIDER", "openai") or "openai",
-                    "model": _env("MEMU_CHAT_MODEL", "unknown") or "unknown",
-                    "fallback": None,
-                    "citations": "off",
-                    "error": str(e),
-                },
-                ensure_ascii=False,
-            )
-        )
+        _emit_json_line(_error_payload(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,73 @@
-import subprocess
+import contextlib
+import io
+import itertools
 import json
 import os
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# json.loads accepts bytes as well, so both branches take the captured
+# output without a decode step; orjson just parses it faster.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Resolve imports the way the subprocess invocation used to via PYTHONPATH:
+# src/ for the memu package, the scripts dir for get/search themselves.
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(_SCRIPTS_DIR), "src"))
+sys.path.insert(0, _SCRIPTS_DIR)
+
+
+def _run_main(main, argv):
+    """Call a script's main() in-process, capturing stdout.
+
+    The scripts write through sys.stdout.buffer, so the replacement stream
+    must expose a binary buffer too. Returns (exit_code, stdout_bytes).
+    """
+    stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    code = 0
+    with contextlib.redirect_stdout(stream):
+        try:
+            main(argv)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+    stream.flush()
+    return code, stream.buffer.getvalue()
+
 
 def verify_get():
-    script_path = os.path.join(os.path.dirname(__file__), "get.py")
-    result = None
+    stdout = None
 
     # Create a temporary test file in workspace (if possible) or use an existing one
     # For this verification, we'll try to read the README.md in the root
-    workspace_dir = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    )
+    workspace_dir = os.path.dirname(os.path.dirname(_SCRIPTS_DIR))
     os.environ["MEMU_WORKSPACE_DIR"] = workspace_dir
     test_file = "README.md"
 
-    # Simulate tool call
-    env = os.environ.copy()
-    env["PYTHONPATH"] = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
-    )
+    # In-process call instead of spawning an interpreter per invocation;
+    # the module (and everything it imports) is paid for once.
+    import get as get_mod
 
     try:
         # Test full read
-        result = subprocess.run(
-            [sys.executable, script_path, test_file],
-            capture_output=True,
-            text=True,
-            check=False,
-            env=env,
-        )
+        returncode, stdout = _run_main(get_mod.main, [test_file])
 
-        if result.returncode != 0:
+        if returncode != 0:
             try:
-                output = json.loads(result.stdout)
+                output = _json_loads(stdout)
                 if "error" in output and "text" in output:
                     print("Received valid JSON error response from get.py")
                     return
             except:
                 pass
-            print(f"get.py failed with return code {result.returncode}")
-            print(f"Stdout: {result.stdout}")
-            print(f"Stderr: {result.stderr}")
+            print(f"get.py failed with exit code {returncode}")
+            print(f"Stdout: {stdout.decode('utf-8', errors='replace')}")
             sys.exit(1)
 
-        output = json.loads(result.stdout)
+        output = _json_loads(stdout)
         print("Get (full) output parsed successfully.")
 
         assert "path" in output, "Output JSON must have 'path' key"
@@ -56,35 +78,25 @@ def verify_get():
 
         from_line = 2
         lines_count = 5
-        result_paged = subprocess.run(
-            [
-                sys.executable,
-                script_path,
-                test_file,
-                "--from",
-                str(from_line),
-                "--lines",
-                str(lines_count),
-            ],
-            capture_output=True,
-            text=True,
-            check=False,
-            env=env,
+        returncode_paged, stdout_paged = _run_main(
+            get_mod.main,
+            [test_file, "--from", str(from_line), "--lines", str(lines_count)],
         )
 
-        if result_paged.returncode != 0:
-            print(f"get.py paged failed with return code {result_paged.returncode}")
+        if returncode_paged != 0:
+            print(f"get.py paged failed with exit code {returncode_paged}")
             sys.exit(1)
 
-        output_paged = json.loads(result_paged.stdout)
+        output_paged = _json_loads(stdout_paged)
         print("Get (paged) output parsed successfully.")
 
         sliced_text = output_paged["text"]
         start_idx = max(0, from_line - 1)
-        expected_lines = full_text.splitlines(keepends=True)[
-            start_idx : start_idx + lines_count
-        ]
-        expected_text = "".join(expected_lines)
+        # Same lazy line walk get.py itself uses: StringIO iterates with
+        # keepends semantics and only the consumed window is materialized.
+        expected_text = "".join(
+            itertools.islice(io.StringIO(full_text), start_idx, start_idx + lines_count)
+        )
 
         assert sliced_text == expected_text, "Paged text does not match expected slice"
         assert len(sliced_text.splitlines()) <= lines_count, (
@@ -93,14 +105,9 @@ def verify_get():
 
         print(f"Verified get.py with full and paged access.")
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error calling get.py: {e}")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"Failed to parse JSON output: {e}")
-        raw_output = result.stdout if result is not None else "N/A"
+        raw_output = stdout.decode("utf-8", errors="replace") if stdout is not None else "N/A"
         print(f"Raw output: {raw_output}")
         sys.exit(1)
     except AssertionError as e:
@@ -1,43 +1,60 @@
-import subprocess
+import contextlib
+import io
 import json
 import os
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Same import setup the old PYTHONPATH env gave the subprocess.
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(_SCRIPTS_DIR), "src"))
+sys.path.insert(0, _SCRIPTS_DIR)
+
+
+def _run_main(main, argv):
+    """Run a script main() in-process and return (exit_code, stdout_bytes)."""
+    stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    code = 0
+    with contextlib.redirect_stdout(stream):
+        try:
+            main(argv)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+    stream.flush()
+    return code, stream.buffer.getvalue()
+
 
 def verify_search():
-    script_path = os.path.join(os.path.dirname(__file__), "search.py")
     query = "test query"
+    stdout = None
 
-    # Simulate tool call
-    env = os.environ.copy()
-    env["PYTHONPATH"] = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
-    )
+    import search as search_mod
 
     try:
-        result = subprocess.run(
-            [sys.executable, script_path, query, "--max-results", "5"],
-            capture_output=True,
-            text=True,
-            check=False,  # We'll handle errors manually to see output
-            env=env,
+        returncode, stdout = _run_main(
+            search_mod.main, [query, "--max-results", "5"]
         )
 
-        if result.returncode != 0:
+        if returncode != 0:
             # Check if it's a valid JSON error response
             try:
-                output = json.loads(result.stdout)
+                output = _json_loads(stdout)
                 if "error" in output and "results" in output:
                     print("Received valid JSON error response from search.py")
                     return
             except:
                 pass
-            print(f"search.py failed with return code {result.returncode}")
-            print(f"Stdout: {result.stdout}")
-            print(f"Stderr: {result.stderr}")
+            print(f"search.py failed with exit code {returncode}")
+            print(f"Stdout: {stdout.decode('utf-8', errors='replace')}")
             sys.exit(1)
 
-        output = json.loads(result.stdout)
+        output = _json_loads(stdout)
 
         print("Search output parsed successfully.")
 
@@ -59,14 +76,9 @@ def verify_search():
 
         print(f"Verified {len(results)} search results.")
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error calling search.py: {e}")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"Failed to parse JSON output: {e}")
-        print(f"Raw output: {result.stdout}")
+        print(f"Raw output: {stdout.decode('utf-8', errors='replace') if stdout is not None else 'N/A'}")
         sys.exit(1)
     except AssertionError as e:
         print(f"Assertion failed: {e}")
@@ -187,6 +187,44 @@ def execute_with_locked_retry(
         raise last_exc
 
 
+def execute_batch_with_locked_retry(
+    db: LazyDatabase,
+    statements: list[tuple[str, tuple[object, ...]]],
+    *,
+    max_retries: int = 3,
+) -> None:
+    """Execute several statements in a single transaction with one commit.
+
+    Avoids the per-statement autocommit fsync that execute_with_locked_retry
+    incurs when callers issue many small writes back to back.
+    """
+    if not statements:
+        return
+    backoffs = (0.1, 0.2, 0.4)
+    last_exc: Exception | None = None
+    for attempt in range(max_retries + 1):
+        try:
+            with sqlite_cursor(db) as (conn, cur):
+                try:
+                    for sql, params in statements:
+                        cur.execute(sql, params or ())
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                return
+        except sqlite3.OperationalError as exc:
+            last_exc = exc
+            message = str(exc).lower()
+            if "locked" not in message and "busy" not in message:
+                raise
+            if attempt >= max_retries:
+                raise
+            time.sleep(backoffs[min(attempt, len(backoffs) - 1)])
+    if last_exc:
+        raise last_exc
+
+
 def fetch_with_locked_retry(
     db: LazyDatabase,
     sql: str,
@@ -218,6 +256,7 @@ def fetch_with_locked_retry(
 __all__ = [
     "ConnectionPool",
     "LazyDatabase",
+    "execute_batch_with_locked_retry",
     "execute_with_locked_retry",
     "fetch_with_locked_retry",
     "sqlite_cursor",
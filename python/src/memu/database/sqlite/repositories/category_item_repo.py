@@ -57,7 +57,7 @@ class SQLiteCategoryItemRepo(SQLiteRepoBase, CategoryItemRepo):
         Returns:
             List of CategoryItem relations.
         """
-        with self._sessions.session() as session:
+        with self._sessions.session(readonly=True) as session:
             stmt = select(self._category_item_model)
             filters = self._build_filters(self._category_item_model, where)
             if filters:
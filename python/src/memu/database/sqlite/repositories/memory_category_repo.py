@@ -57,7 +57,7 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
         Returns:
             Dictionary of category ID to MemoryCategory mapping.
         """
-        with self._sessions.session() as session:
+        with self._sessions.session(readonly=True) as session:
             stmt = select(self._memory_category_model)
             filters = self._build_filters(self._memory_category_model, where)
             if filters:
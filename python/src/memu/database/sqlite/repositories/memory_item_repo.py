@@ -63,7 +63,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
         if item_id in self.items:
             return self.items[item_id]
 
-        with self._sessions.session() as session:
+        with self._sessions.session(readonly=True) as session:
             stmt = select(self._memory_item_model).where(self._memory_item_model.id == item_id)
             row = session.exec(stmt).first()
 
@@ -92,7 +92,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
         Returns:
             Dictionary of item ID to MemoryItem mapping.
         """
-        with self._sessions.session() as session:
+        with self._sessions.session(readonly=True) as session:
             stmt = select(self._memory_item_model)
             filters = self._build_filters(self._memory_item_model, where)
             if filters:
@@ -133,7 +133,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
 
         from sqlalchemy import func
 
-        with self._sessions.session() as session:
+        with self._sessions.session(readonly=True) as session:
             stmt = select(self._memory_item_model)
             filters = self._build_filters(self._memory_item_model, where)
             # Add filter for json_extract(extra, '$.ref_id') IN ref_ids (only rows with ref_id key)
@@ -61,7 +61,7 @@ class SQLiteResourceRepo(SQLiteRepoBase, ResourceRepo):
         if not where and self.resources:
             return dict(self.resources)
 
-        with self._sessions.session() as session:
+        with self._sessions.session(readonly=True) as session:
             stmt = select(self._resource_model)
             filters = self._build_filters(self._resource_model, where)
             if filters:
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import logging
+import os
 from pathlib import Path
 from typing import Any
 
 from sqlalchemy import event
 from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import QueuePool
 from sqlmodel import Session, create_engine
 
 logger = logging.getLogger(__name__)
@@ -18,69 +19,144 @@ logger = logging.getLogger(__name__)
 class SQLiteSessionManager:
     """Handle engine lifecycle and session creation for SQLite store."""
 
+    # Tuning pragmas applied per connection on top of the journaling set:
+    # 64MB page cache, in-memory temp tables and a 256MB mmap window keep
+    # repeat lookups and sorts off the disk. Override (or disable with None)
+    # via engine_kwargs={"pragmas": {...}}.
+    _TUNING_PRAGMAS: dict[str, Any] = {
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+    }
+
     def __init__(self, *, dsn: str, engine_kwargs: dict[str, Any] | None = None) -> None:
         """Initialize SQLite session manager.
 
         Args:
             dsn: SQLite connection string (e.g., "sqlite:///path/to/db.sqlite").
-            engine_kwargs: Optional keyword arguments for create_engine.
+            engine_kwargs: Optional keyword arguments for create_engine. A
+                "pragmas" entry is popped and merged over the default tuning
+                pragmas instead of being forwarded.
         """
         # Ensure parent directory exists and the DB file is touchable.
         # This removes a common source of intermittent "unable to open database file" errors.
+        db_path: str | None = None
         try:
             url = make_url(dsn)
             db_path = url.database
             if db_path and db_path != ":memory:":
                 path = Path(db_path)
-                if path.parent:
-                    path.parent.mkdir(parents=True, exist_ok=True)
-                path.touch(exist_ok=True)
+                # One stat on the hot path; mkdir/touch only when the file is
+                # actually missing (first run), not on every reconstruction.
+                if not path.exists():
+                    if path.parent:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                    path.touch(exist_ok=True)
         except Exception:
             logger.debug("Failed to preflight sqlite path for dsn=%s", dsn, exc_info=True)
 
-        kw: dict[str, Any] = {
-            # Allow multi-threaded access
-            "connect_args": {
-                "check_same_thread": False,
-                # Wait a bit for locks instead of failing fast
-                "timeout": 30,
-            },
-            # Avoid cross-thread/process connection reuse issues
-            "poolclass": NullPool,
-        }
+        is_memory = not db_path or db_path == ":memory:"
+
+        pragmas = dict(self._TUNING_PRAGMAS)
         if engine_kwargs:
-            kw.update(engine_kwargs)
+            engine_kwargs = dict(engine_kwargs)
+            pragmas.update(engine_kwargs.pop("pragmas", {}) or {})
+        pragmas = {name: value for name, value in pragmas.items() if value is not None}
 
-        self._engine = create_engine(dsn, **kw)
+        base_connect_args = {
+            # Allow multi-threaded access
+            "check_same_thread": False,
+            # Wait a bit for locks instead of failing fast
+            "timeout": 30,
+        }
 
-        @event.listens_for(self._engine, "connect")
+        # Single-writer engine: one pooled connection and BEGIN IMMEDIATE so
+        # write transactions take the sqlite lock up front instead of failing
+        # with SQLITE_BUSY mid-transaction when a reader got there first.
+        write_kw: dict[str, Any] = {
+            "connect_args": dict(base_connect_args),
+            "poolclass": QueuePool,
+            "pool_size": 1,
+            "max_overflow": 0,
+        }
+        if engine_kwargs:
+            write_kw.update(engine_kwargs)
+        self._write_engine = create_engine(dsn, **write_kw)
+        self._register_pragmas(self._write_engine, readonly=False, tuning=pragmas)
+
+        @event.listens_for(self._write_engine, "begin")
+        def _begin_immediate(conn: Any) -> None:  # noqa: ANN401
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+        if is_memory:
+            # Separate engines would see separate in-memory databases.
+            self._read_engine = self._write_engine
+        else:
+            read_kw: dict[str, Any] = {
+                "connect_args": dict(base_connect_args),
+                "poolclass": QueuePool,
+                "pool_size": max(2, os.cpu_count() or 2),
+                "max_overflow": 0,
+            }
+            if engine_kwargs:
+                read_kw.update(engine_kwargs)
+            self._read_engine = create_engine(dsn, **read_kw)
+            # query_only (rather than mode=ro URIs) keeps readers able to
+            # create the WAL shm mapping on a cold database while still
+            # rejecting any write statement.
+            self._register_pragmas(self._read_engine, readonly=True, tuning=pragmas)
+
+    @staticmethod
+    def _register_pragmas(engine: Any, *, readonly: bool, tuning: dict[str, Any]) -> None:  # noqa: ANN401
+        @event.listens_for(engine, "connect")
         def _set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:  # noqa: ANN401
+            if not readonly:
+                # Disable pysqlite's implicit BEGIN so the engine-level
+                # BEGIN IMMEDIATE listener controls transaction start.
+                dbapi_connection.isolation_level = None
             try:
                 cursor = dbapi_connection.cursor()
                 cursor.execute("PRAGMA journal_mode=WAL;")
                 cursor.execute("PRAGMA synchronous=NORMAL;")
                 cursor.execute("PRAGMA foreign_keys=ON;")
                 cursor.execute("PRAGMA busy_timeout=5000;")
+                if readonly:
+                    cursor.execute("PRAGMA query_only=ON;")
+                for name, value in tuning.items():
+                    # Each tuning pragma fails independently so an old sqlite
+                    # build missing one doesn't drop the rest.
+                    try:
+                        cursor.execute(f"PRAGMA {name}={value};")
+                    except Exception:
+                        logger.debug("Failed to set sqlite pragma %s", name, exc_info=True)
                 cursor.close()
             except Exception:
                 # Best-effort; don't fail connect if a pragma isn't supported.
                 logger.debug("Failed to set sqlite pragmas", exc_info=True)
 
-    def session(self) -> Session:
-        """Create a new database session."""
-        return Session(self._engine, expire_on_commit=False)
+    def session(self, *, readonly: bool = False) -> Session:
+        """Create a new database session.
+
+        Args:
+            readonly: Use the pooled read engine; such sessions reject writes
+                and never contend with the single writer.
+        """
+        engine = self._read_engine if readonly else self._write_engine
+        return Session(engine, expire_on_commit=False)
 
     def close(self) -> None:
-        """Close the database engine and release resources."""
+        """Close the database engines and release resources."""
         try:
-            self._engine.dispose()
+            self._write_engine.dispose()
+            if self._read_engine is not self._write_engine:
+                self._read_engine.dispose()
         except SQLAlchemyError:
             logger.exception("Failed to close SQLite engine")
 
     @property
     def engine(self) -> Any:
-        """Return the underlying SQLAlchemy engine."""
-        return self._engine
+        """Return the underlying SQLAlchemy write engine."""
+        return self._write_engine
 
 
 __all__ = ["SQLiteSessionManager"]
@@ -8,6 +8,12 @@ import tempfile
 import json
 import shutil
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    _dumps = lambda obj: json.dumps(obj).encode("utf-8")  # noqa: E731
+
 # 设置环境变量
 TEST_DIR = tempfile.mkdtemp(prefix="memu_test_")
 SESSIONS_DIR = os.path.join(TEST_DIR, "sessions")
@@ -25,29 +31,37 @@ from convert_sessions import convert, _extract_session_id, _load_state, _save_st
 
 
 def create_openclaw_jsonl(file_path: str, messages: list[tuple[str, str]]) -> None:
-    """创建符合 OpenClaw 格式的 JSONL 文件"""
-    with open(file_path, "w") as f:
-        # 写入 session header
-        f.write(json.dumps({
-            "type": "session",
-            "version": 3,
-            "id": "test-session",
-            "timestamp": "2026-02-09T10:00:00.000Z"
-        }) + "\n")
-        
-        # 写入消息
-        for i, (role, content) in enumerate(messages):
-            msg = {
-                "type": "message",
-                "id": f"msg-{i}",
-                "parentId": None,
-                "timestamp": f"2026-02-09T10:0{i}:00.000Z",
-                "message": {
-                    "role": role,
-                    "content": [{"type": "text", "text": content}]
-                }
+    """创建符合 OpenClaw 格式的 JSONL 文件（writev 一次聚合写入所有行）"""
+    bufs = [_dumps({
+        "type": "session",
+        "version": 3,
+        "id": "test-session",
+        "timestamp": "2026-02-09T10:00:00.000Z"
+    }) + b"\n"]
+
+    # 消息
+    for i, (role, content) in enumerate(messages):
+        msg = {
+            "type": "message",
+            "id": f"msg-{i}",
+            "parentId": None,
+            "timestamp": f"2026-02-09T10:0{i}:00.000Z",
+            "message": {
+                "role": role,
+                "content": [{"type": "text", "text": content}]
             }
-            f.write(json.dumps(msg) + "\n")
+        }
+        bufs.append(_dumps(msg) + b"\n")
+
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, bufs)
+        else:
+            # Windows 没有 writev，退化为单次 write
+            os.write(fd, b"".join(bufs))
+    finally:
+        os.close(fd)
 
 
 def test_regex_matching():
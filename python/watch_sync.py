@@ -1,16 +1,55 @@
+import atexit
+import functools
 import time
 import subprocess
+import errno
 import os
+import fcntl
+import hashlib
 import json
+import sched
+import select
+import stat
 import tempfile
 import sys
 import signal
+import threading
 import traceback
 from typing import Optional, Dict, Tuple, Any, TYPE_CHECKING
 
-from watchdog.observers import Observer
+# Observer() auto-selects a backend and can quietly fall back to the
+# polling observer, which re-walks every watched tree on a timer. Ask for
+# the kernel-event inotify backend explicitly on Linux; elsewhere the
+# auto-selection picks the right native backend.
+if sys.platform.startswith("linux"):
+    try:
+        from watchdog.observers.inotify import InotifyObserver as Observer
+    except Exception:
+        from watchdog.observers import Observer
+else:
+    from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+try:
+    # watchdog's inotify backend sleeps 500ms per event batch to pair
+    # moved_from/moved_to into one move event. We react identically to a
+    # move pair and to a delete+create, so that buffer is pure added
+    # latency on every session flush; drop it on Linux.
+    from watchdog.observers.inotify_buffer import InotifyBuffer
+
+    InotifyBuffer.delay = 0
+except Exception:
+    pass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson decodes noticeably faster than stdlib json and is used when
+# available; these settings blobs are re-parsed on every reconcile tick.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 if TYPE_CHECKING:
     pass
 
@@ -37,21 +76,70 @@ def _trigger_lock_name(script_name: str) -> str:
     return os.path.join(tempfile.gettempdir(), f"memu_sync.trigger.lock_{safe}")
 
 
+def _proc_starttime(pid: int):
+    """Kernel start time (clock ticks) for a PID, or None when unavailable.
+
+    Read from field 22 of /proc/<pid>/stat; the comm field can contain spaces
+    and parentheses, so parsing starts after the last ')'. A (pid, starttime)
+    pair uniquely identifies a process even after the PID number is recycled.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+        rest = data[data.rindex(b")") + 2 :].split()
+        return int(rest[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _pid_running(pid: int) -> bool:
+    """Whether a process with this PID currently exists.
+
+    Prefers pidfd_open (Linux >= 5.3): a pidfd that polls readable belongs
+    to a process that has already exited, even if it lingers as a zombie
+    that kill(pid, 0) would still report as alive. Falls back to the
+    kill(pid, 0) probe elsewhere.
+    """
+    if hasattr(os, "pidfd_open"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass  # ENOSYS on older kernels; use the signal probe.
+        else:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return not poller.poll(0)
+            finally:
+                os.close(fd)
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Cannot signal; assume alive.
+        return True
+
+
 def _is_lock_held(lock_path: str) -> bool:
     """PID-aware check whether a lock file is held by a live process."""
     try:
         with open(lock_path, "r", encoding="utf-8") as f:
-            pid_str = f.read().strip()
-        pid = int(pid_str)
+            parts = f.read().split()
+        pid = int(parts[0])
         if pid > 1:
-            try:
-                os.kill(pid, 0)
-                return True
-            except ProcessLookupError:
+            if not _pid_running(pid):
                 return False
-            except PermissionError:
-                # Cannot signal; assume alive.
-                return True
+            if len(parts) > 1:
+                # The holder recorded its start time; a mismatch means the
+                # PID was recycled by an unrelated process after a crash.
+                current = _proc_starttime(pid)
+                if current is not None and current != int(parts[1]):
+                    return False
+            return True
     except FileNotFoundError:
         return False
     except Exception:
@@ -61,76 +149,115 @@ def _is_lock_held(lock_path: str) -> bool:
     return False
 
 
-def _try_acquire_lock(lock_path: str, stale_seconds: int = 15 * 60):
-    """Best-effort cross-platform lock using O_EXCL.
+def _try_acquire_lock(lock_path: str):
+    """Non-blocking lock using fcntl.flock on a persistent lock file.
 
-    - Non-blocking: if another process holds the lock, skip this sync trigger.
-    - Stale lock recovery: if the lock file is older than stale_seconds, remove it.
+    The kernel releases the lock automatically when the holder exits or
+    closes the fd, so crashed holders never need stale-file recovery. The
+    PID is still written for diagnostics and for PID-aware inspection of
+    worker-owned locks.
     """
-
-    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
     try:
-        fd = os.open(lock_path, flags)
-        with os.fdopen(fd, "w", encoding="utf-8", closefd=False) as f:
-            f.write(str(os.getpid()))
-        return fd
-    except FileExistsError:
-        try:
-            # PID-aware check: if the process in the lock file is alive,
-            # treat it as held forever (mtime-based stale checks are unreliable
-            # for long-running daemons because the lock file is not touched).
-            try:
-                with open(lock_path, "r", encoding="utf-8") as f:
-                    pid_str = f.read().strip()
-                pid = int(pid_str)
-                if pid > 1:
-                    try:
-                        os.kill(pid, 0)
-                        return None
-                    except ProcessLookupError:
-                        # PID not alive; recover immediately.
-                        try:
-                            os.remove(lock_path)
-                        except FileNotFoundError:
-                            pass
-                        return _try_acquire_lock(lock_path, stale_seconds=stale_seconds)
-                    except PermissionError:
-                        # Cannot signal it; assume it's alive.
-                        return None
-            except Exception:
-                # Fall back to mtime-based stale check.
-                pass
-
-            age = time.time() - os.path.getmtime(lock_path)
-            if age > stale_seconds:
-                os.remove(lock_path)
-                return _try_acquire_lock(lock_path, stale_seconds=stale_seconds)
-        except FileNotFoundError:
-            return _try_acquire_lock(lock_path, stale_seconds=stale_seconds)
-        except Exception:
-            pass
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
         return None
+    try:
+        os.ftruncate(fd, 0)
+        pid = os.getpid()
+        started = _proc_starttime(pid)
+        token = f"{pid} {started}" if started is not None else str(pid)
+        os.write(fd, token.encode("utf-8"))
+    except OSError:
+        pass
+    return fd
 
 
 def _release_lock(lock_path: str, lock_handle):
-    try:
-        if isinstance(lock_handle, int):
-            try:
-                os.close(lock_handle)
-            except OSError:
-                pass
-    finally:
+    # Closing the fd drops the flock. The lock file itself stays: unlinking
+    # it would let a racing acquirer lock a new inode while another process
+    # still holds the old one.
+    if isinstance(lock_handle, int):
         try:
-            os.remove(lock_path)
-        except FileNotFoundError:
+            os.close(lock_handle)
+        except OSError:
             pass
 
 
+# Shared debounce scheduler. A threading.Timer per event burst spawns and
+# tears down a whole thread each time; one daemon thread draining a
+# sched.scheduler serves every handler's trailing-edge timers instead.
+# sched's enter/cancel are thread-safe. Monotonic timefunc: a wall-clock
+# step (NTP, suspend/resume) must not stretch or collapse pending delays.
+_SCHEDULER = sched.scheduler(time.monotonic, time.sleep)
+_SCHEDULER_WAKE = threading.Event()
+_SCHEDULER_GUARD = threading.Lock()
+_scheduler_thread: Optional[threading.Thread] = None
+
+
+def _scheduler_loop():
+    while True:
+        # Runs due actions, returns seconds until the next one (None when
+        # the queue is empty — then sleep until a new entry wakes us).
+        delay = _SCHEDULER.run(blocking=False)
+        _SCHEDULER_WAKE.wait(timeout=delay)
+        _SCHEDULER_WAKE.clear()
+
+
+def _schedule(delay: float, action, kwargs: dict):
+    global _scheduler_thread
+    with _SCHEDULER_GUARD:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_thread = threading.Thread(
+                target=_scheduler_loop, name="memu-sync-timer", daemon=True
+            )
+            _scheduler_thread.start()
+    event = _SCHEDULER.enter(max(delay, 0.0), 1, action, kwargs=kwargs)
+    _SCHEDULER_WAKE.set()
+    return event
+
+
+def _cancel_scheduled(event) -> None:
+    try:
+        _SCHEDULER.cancel(event)
+    except ValueError:
+        # Already fired or cancelled.
+        pass
+
+
+def _schedule_watch(observer: Any, handler: Any, path: str, *, recursive: bool):
+    """observer.schedule with an actionable message on watch exhaustion.
+
+    Returns the watch, or None when the kernel refuses it — the watcher
+    keeps running degraded (idle-flush polling still works) rather than
+    dying at startup over one unwatchable directory.
+    """
+    try:
+        return observer.schedule(handler, path, recursive=recursive)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            print(
+                f"Cannot watch {path}: inotify watch limit reached; raise it "
+                "with: sysctl fs.inotify.max_user_watches=524288"
+            )
+        else:
+            print(f"Cannot watch {path}: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=1)
 def get_extra_paths():
+    # Cached: the env var is fixed for the process lifetime. The narrow
+    # except keeps KeyboardInterrupt/SystemExit propagating.
     try:
-        return json.loads(os.getenv("MEMU_EXTRA_PATHS", "[]"))
-    except:
+        paths = _json_loads(os.getenv("MEMU_EXTRA_PATHS", "[]"))
+    except (ValueError, TypeError):
         return []
+    return paths if isinstance(paths, list) else []
 
 
 def _docs_full_scan_marker_path() -> Optional[str]:
@@ -145,7 +272,7 @@ def _enabled_agents_from_settings() -> list[str]:
     if not raw.strip():
         return ["main"]
     try:
-        loaded = json.loads(raw)
+        loaded = _json_loads(raw)
     except Exception:
         return ["main"]
     if not isinstance(loaded, dict):
@@ -201,28 +328,38 @@ def _should_run_idle_flush(
     session_files: Optional[list[str]],
     agent_name: str,
     flush_idle_seconds: int,
-) -> bool:
+) -> tuple[bool, str]:
     """Low-overhead check to avoid needless auto_sync calls.
 
     We trigger auto_sync only if:
     - at least one tracked session file has been idle for long enough, AND
     - there is a staged tail file present (otherwise we'd spin with converted_paths=0).
+
+    Returns (should_run, idle_signature). The signature is built from the
+    same stat results the idleness check needs, so the caller does not stat
+    every session file a second time per poll tick.
     """
     if flush_idle_seconds <= 0:
-        return False
+        return False, ""
     if not session_files:
-        return False
+        return False, ""
 
     memu_data_dir = os.getenv("MEMU_DATA_DIR")
     if not memu_data_dir:
-        return False
+        return False, ""
 
     now = time.time()
+    should_run = False
+    signature_parts: list[str] = []
     for session_file in session_files:
         try:
-            mtime = os.path.getmtime(session_file)
+            mtime = os.stat(session_file).st_mtime
         except Exception:
             continue
+        signature_parts.append(f"{session_file}:{mtime}")
+
+        if should_run:
+            continue
 
         # Only consider idle flush when session file itself is idle.
         if (now - mtime) < flush_idle_seconds:
@@ -253,31 +390,72 @@ def _should_run_idle_flush(
             except Exception:
                 continue
             if st.st_size >= 10:
-                return True
+                should_run = True
+                break
 
-    return False
+    return should_run, "|".join(signature_parts)
 
 
 class SyncHandler(FileSystemEventHandler):
     def __init__(self, script_name, extensions, *, should_trigger=None):
         self.script_name = script_name
-        self.extensions = extensions
-        self.last_run = 0
+        # Fixed for the handler's lifetime; build the spawn argv once
+        # instead of re-joining the script path on every trigger.
+        self._argv = [sys.executable, os.path.join(MEMU_DIR, script_name)]
+        # str.endswith loops a tuple in C; one call filters an event instead
+        # of a generator plus one endswith per extension.
+        self.extensions = tuple(extensions)
+        # Monotonic timestamp of the last leading-edge run; -inf so the
+        # first trigger always takes the immediate path regardless of where
+        # the monotonic epoch happens to start.
+        self.last_run = float("-inf")
         self.debounce_seconds = int(
             os.getenv("MEMU_SYNC_DEBOUNCE_SECONDS", "20") or "20"
         )
+        # Quiet period for the trailing edge: a burst flushes this long after
+        # its last event, rather than always waiting out the full debounce
+        # window. debounce_seconds stays the max-wait bound during sustained
+        # writes.
+        self.quiet_seconds = float(
+            os.getenv("MEMU_SYNC_QUIET_SECONDS", "2") or "2"
+        )
         self.should_trigger = should_trigger
-
-    @staticmethod
-    def _matches_extensions(path: str | None, extensions: list[str]) -> bool:
-        if not path:
-            return False
-        return any(path.endswith(ext) for ext in extensions)
+        # Trailing-edge debounce state: events landing inside the debounce
+        # window re-arm one entry on the shared scheduler instead of being
+        # dropped outright.
+        self._timer: Any = None
+        self._timer_lock = threading.Lock()
+        # Every distinct path seen while a deferred run is pending. The
+        # trailing-edge flush hands the whole batch downstream instead of
+        # only the last event's path, so no file in a burst is skipped.
+        self._pending_paths: set[str] = set()
+        # Resident worker: auto_sync and docs_ingest support a --server loop
+        # that runs one unit of work per stdin token, skipping the
+        # interpreter + import cold start on every trigger. Set
+        # MEMU_RESIDENT_SYNC_WORKER=0 to always spawn.
+        self._worker: Optional[subprocess.Popen] = None
+        self._use_resident_worker = script_name in (
+            "auto_sync.py",
+            "docs_ingest.py",
+        ) and (
+            os.getenv("MEMU_RESIDENT_SYNC_WORKER", "1") or "1"
+        ).strip().lower() not in ("0", "false", "no")
+        # os._Environ iteration is slower than a plain dict copy, and the
+        # environment is fixed for the process by the time handlers exist;
+        # snapshot it once and merge per-trigger overrides on top.
+        self._base_env = os.environ.copy()
+        # Last-seen tail digest per changed path; editors and tools fire
+        # modify events on metadata-only touches, which should not cost a
+        # sync run when the bytes are identical.
+        self._path_digest: dict[str, bytes] = {}
+
+    def _matches_extensions(self, path: str | None) -> bool:
+        return bool(path) and path.endswith(self.extensions)
 
     def _handle_event(self, *, src_path: str, dest_path: str | None = None):
         if not (
-            self._matches_extensions(src_path, self.extensions)
-            or self._matches_extensions(dest_path, self.extensions)
+            self._matches_extensions(src_path)
+            or self._matches_extensions(dest_path)
         ):
             return
 
@@ -332,14 +510,145 @@ class SyncHandler(FileSystemEventHandler):
         changed_path: str | None = None,
         extra_env: dict[str, str] | None = None,
     ):
-        now = time.time()
-        if now - self.last_run < self.debounce_seconds:
-            return
+        with self._timer_lock:
+            if changed_path:
+                self._pending_paths.add(changed_path)
+            # Monotonic: debounce must measure real elapsed time, not a
+            # wall clock that can jump backwards and pin the window open.
+            now = time.monotonic()
+            elapsed = now - self.last_run
+            if elapsed >= self.debounce_seconds:
+                # Leading edge: idle handler, run immediately (keeps the
+                # initial sync on startup prompt).
+                self.last_run = now
+                batch = self._pending_paths
+                self._pending_paths = set()
+            else:
+                # Inside the debounce window: coalesce into one trailing-edge
+                # run instead of dropping the event. Each event pushes the
+                # flush out by the quiet period, capped at the window end so
+                # sustained writes still sync at least once per window. The
+                # latest event's payload wins.
+                if self._timer is not None:
+                    _cancel_scheduled(self._timer)
+                delay = min(self.quiet_seconds, self.debounce_seconds - elapsed)
+                self._timer = _schedule(
+                    delay,
+                    self._run_deferred,
+                    {"changed_path": changed_path, "extra_env": extra_env},
+                )
+                return
+
+        self._run_sync(changed_path=changed_path, extra_env=extra_env, batch=batch)
 
+    def _run_deferred(
+        self,
+        *,
+        changed_path: str | None = None,
+        extra_env: dict[str, str] | None = None,
+    ):
+        with self._timer_lock:
+            self._timer = None
+            self.last_run = time.monotonic()
+            batch = self._pending_paths
+            self._pending_paths = set()
+        self._run_sync(changed_path=changed_path, extra_env=extra_env, batch=batch)
+
+    def _notify_worker(
+        self,
+        *,
+        changed_path: str | None = None,
+        extra_env: dict[str, str] | None = None,
+        batch: set[str] | None = None,
+    ) -> bool:
+        """Hand the trigger to the resident worker (one token per sync).
+
+        Trigger-scoped env vars travel inside the token because the worker
+        inherits its environment once at spawn. Returns False when the worker
+        cannot be reached so the caller falls back to a one-shot spawn.
+        """
+        payload: dict[str, str] = {}
+        if changed_path:
+            payload["MEMU_CHANGED_PATH"] = changed_path
+        if batch and len(batch) > 1:
+            payload["MEMU_CHANGED_PATHS"] = os.pathsep.join(sorted(batch))
+        if extra_env:
+            payload.update(extra_env)
+        token = (json.dumps(payload) if payload else "GO").encode("utf-8") + b"\n"
+        try:
+            worker = self._worker
+            if worker is None or worker.poll() is not None:
+                worker = subprocess.Popen(
+                    self._argv + ["--server"],
+                    stdin=subprocess.PIPE,
+                    cwd=MEMU_DIR,
+                )
+                self._worker = worker
+            worker.stdin.write(token)
+            worker.stdin.flush()
+            return True
+        except Exception as e:
+            print(
+                f"Resident {self.script_name} worker unavailable ({e}); falling back to spawn"
+            )
+            self._worker = None
+            return False
+
+    def _content_changed(self, changed_path: str | None) -> bool:
+        """Digest the tail of the changed file to filter metadata-only events.
+
+        Transcripts are append-only, so the last 64KB plus the size is enough
+        to tell a real write from a chmod/utime touch. Unreadable or removed
+        paths always count as changed — rotations and salvage triggers must
+        not be suppressed.
+        """
+        if not changed_path:
+            return True
+        try:
+            with open(changed_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > 65536:
+                    f.seek(-65536, os.SEEK_END)
+                h = hashlib.blake2b(f.read(), digest_size=8)
+                h.update(str(size).encode("ascii"))
+                digest = h.digest()
+        except OSError:
+            self._path_digest.pop(changed_path, None)
+            return True
+        if self._path_digest.get(changed_path) == digest:
+            return False
+        self._path_digest[changed_path] = digest
+        return True
+
+    def _run_sync(
+        self,
+        *,
+        changed_path: str | None = None,
+        extra_env: dict[str, str] | None = None,
+        batch: set[str] | None = None,
+    ):
+        if batch and len(batch) > 1:
+            # A run only needs suppressing when nothing in the batch has
+            # new bytes; digest every path so the caches stay warm.
+            changed = {p for p in batch if self._content_changed(p)}
+            if not changed:
+                return
+            batch = changed
+            if changed_path not in changed:
+                changed_path = next(iter(changed))
+        elif not self._content_changed(changed_path):
+            return
         print(
             f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Change detected, triggering {self.script_name}..."
         )
 
+        if self._use_resident_worker and self._notify_worker(
+            changed_path=changed_path, extra_env=extra_env, batch=batch
+        ):
+            # The worker serializes runs itself (one token per sync) and
+            # auto_sync's own run lock still guards against manual runs.
+            return
+
         # If the worker is already running, don't even spawn it.
         run_lock = _run_lock_name(self.script_name)
         if _is_lock_held(run_lock):
@@ -350,14 +659,19 @@ class SyncHandler(FileSystemEventHandler):
         if lock_handle is None:
             return
         try:
-            self.last_run = time.time()
-            env = os.environ.copy()
-            if changed_path:
-                env["MEMU_CHANGED_PATH"] = changed_path
-            if extra_env:
-                env.update(extra_env)
-            script_path = os.path.join(MEMU_DIR, self.script_name)
-            subprocess.run([sys.executable, script_path], cwd=MEMU_DIR, env=env)
+            if changed_path or extra_env:
+                env = dict(self._base_env)
+                if changed_path:
+                    env["MEMU_CHANGED_PATH"] = changed_path
+                if batch and len(batch) > 1:
+                    env["MEMU_CHANGED_PATHS"] = os.pathsep.join(sorted(batch))
+                if extra_env:
+                    env.update(extra_env)
+            else:
+                # No overrides: env=None makes the child inherit our environ
+                # at the C level, skipping dict marshalling entirely.
+                env = None
+            subprocess.run(self._argv, cwd=MEMU_DIR, env=env)
         except Exception as e:
             print(f"Failed to trigger {self.script_name}: {e}")
         finally:
@@ -387,8 +701,9 @@ def start_watching_agent(
 
     sessions_dir_abs = os.path.abspath(sessions_dir)
     enabled_agents = _enabled_agents_from_settings()
-    session_files_box: Dict[str, dict[str, list[str]]] = {
-        "paths": _get_agent_session_files(sessions_dir, enabled_agents)
+    session_files_box: Dict[str, Any] = {
+        "paths": _get_agent_session_files(sessions_dir, enabled_agents),
+        "tracked_abs": None,
     }
 
     def _tracked_session_files() -> list[str]:
@@ -397,14 +712,39 @@ def start_watching_agent(
             return []
         return tracked
 
+    def _refresh_tracked() -> None:
+        session_files_box["paths"] = _get_agent_session_files(
+            sessions_dir, _enabled_agents_from_settings()
+        )
+        session_files_box["tracked_abs"] = None
+
+    def _tracked_abs() -> set[str]:
+        # Rebuilt only after a refresh; every other event reuses the set
+        # instead of re-abspathing the tracked paths per wakeup.
+        cached = session_files_box.get("tracked_abs")
+        if cached is None:
+            cached = {
+                os.path.abspath(path)
+                for path in _tracked_session_files()
+                if isinstance(path, str) and path
+            }
+            session_files_box["tracked_abs"] = cached
+        return cached
+
+    sessions_json_abs = os.path.join(sessions_dir_abs, "sessions.json")
+
     def _is_sessions_json_path(path: str) -> bool:
         if not path:
             return False
+        # watchdog reports absolute paths when the watched root is absolute,
+        # so the common case is one string compare; abspath (getcwd + string
+        # normalization per call) is only the relative-path fallback.
+        if path == sessions_json_abs:
+            return True
+        if os.path.isabs(path):
+            return False
         try:
-            p = os.path.abspath(path)
-            return os.path.dirname(p) == sessions_dir_abs and os.path.basename(
-                p
-            ) == "sessions.json"
+            return os.path.abspath(path) == sessions_json_abs
         except Exception:
             return False
 
@@ -414,25 +754,22 @@ def start_watching_agent(
         paths = [p for p in (src_path, dest_path) if p]
         abs_paths = []
         for p in paths:
+            if os.path.isabs(p):
+                abs_paths.append(p)
+                continue
             try:
                 abs_paths.append(os.path.abspath(p))
             except Exception:
                 continue
 
         if any(_is_sessions_json_path(p) for p in paths):
-            session_files_box["paths"] = _get_agent_session_files(
-                sessions_dir, _enabled_agents_from_settings()
-            )
+            _refresh_tracked()
             return True, {
                 "MEMU_AGENT_NAME": agent_name,
                 "OPENCLAW_SESSIONS_DIR": sessions_dir,
             }
 
-        tracked_abs = {
-            os.path.abspath(path)
-            for path in _tracked_session_files()
-            if isinstance(path, str) and path
-        }
+        tracked_abs = _tracked_abs()
 
         if tracked_abs and any(p in tracked_abs for p in abs_paths):
             return True, {
@@ -447,9 +784,7 @@ def start_watching_agent(
         )
         if interested:
             prev_tracked = _tracked_session_files()
-            session_files_box["paths"] = _get_agent_session_files(
-                sessions_dir, _enabled_agents_from_settings()
-            )
+            _refresh_tracked()
             refreshed_tracked = _tracked_session_files()
 
             prev_ids = {
@@ -479,11 +814,7 @@ def start_watching_agent(
                 extra_env["OPENCLAW_SESSIONS_DIR"] = sessions_dir
                 return (True, extra_env)
 
-            refreshed_abs = {
-                os.path.abspath(path)
-                for path in refreshed_tracked
-                if isinstance(path, str) and path
-            }
+            refreshed_abs = _tracked_abs()
             if refreshed_abs and any(p in refreshed_abs for p in abs_paths):
                 return True, {
                     "MEMU_AGENT_NAME": agent_name,
@@ -495,7 +826,7 @@ def start_watching_agent(
     session_handler = SyncHandler(
         "auto_sync.py", [".jsonl", ".json"], should_trigger=_sessions_should_trigger
     )
-    watch = observer.schedule(session_handler, sessions_dir, recursive=False)
+    watch = _schedule_watch(observer, session_handler, sessions_dir, recursive=False)
     # Trigger initial sync
     session_handler.trigger_sync(
         changed_path=_tracked_session_files()[0] if _tracked_session_files() else None,
@@ -507,7 +838,7 @@ def start_watching_agent(
 
     state = {
         "session_files_box": session_files_box,
-        "last_poll_tick": 0,
+        "last_poll_tick": None,
         "last_idle_trigger_sig": None,
         "watch": watch,
     }
@@ -569,33 +900,35 @@ def process_agent_idle_flushes(
                 results["success"].append(agent_name)
                 continue
 
-            now_i = int(time.time())
-            if now_i % flush_poll_seconds != 0 or now_i == state["last_poll_tick"]:
+            # Elapsed-time gate rather than a wall-clock modulo so the check
+            # is correct for any caller cadence, not just a 1s tick. The
+            # monotonic clock keeps the cadence steady across NTP steps and
+            # suspend/resume.
+            now_m = time.monotonic()
+            last_tick = state["last_poll_tick"]
+            if last_tick is not None and now_m - last_tick < flush_poll_seconds:
                 results["success"].append(agent_name)
                 continue
 
-            state["last_poll_tick"] = now_i
+            state["last_poll_tick"] = now_m
             sessions_dir = agent_dirs.get(agent_name)
             if sessions_dir:
                 enabled_agents_now = _enabled_agents_from_settings()
                 session_files_box["paths"] = _get_agent_session_files(
                     sessions_dir, enabled_agents_now
                 )
+                session_files_box["tracked_abs"] = None
 
             tracked_session_files = session_files_box["paths"].get(agent_name)
-            if tracked_session_files and _should_run_idle_flush(
-                session_files=tracked_session_files,
-                agent_name=agent_name,
-                flush_idle_seconds=flush_idle_seconds,
-            ):
-                signature_parts: list[str] = []
-                for session_file in tracked_session_files:
-                    try:
-                        mtime = os.path.getmtime(session_file)
-                    except Exception:
-                        continue
-                    signature_parts.append(f"{session_file}:{mtime}")
-                idle_sig = "|".join(signature_parts)
+            should_flush = False
+            idle_sig = ""
+            if tracked_session_files:
+                should_flush, idle_sig = _should_run_idle_flush(
+                    session_files=tracked_session_files,
+                    agent_name=agent_name,
+                    flush_idle_seconds=flush_idle_seconds,
+                )
+            if should_flush:
                 if idle_sig and idle_sig != state["last_idle_trigger_sig"]:
                     state["last_idle_trigger_sig"] = idle_sig
                     handler.trigger_sync(
@@ -629,6 +962,10 @@ if __name__ == "__main__":
     if watcher_lock_handle is None:
         print("Another memU watcher is already running. Exiting.")
         raise SystemExit(0)
+    # Single cleanup path: atexit covers the signal handlers' SystemExit,
+    # KeyboardInterrupt and any sys.exit() reached below, so no explicit
+    # release is scattered through the shutdown branches.
+    atexit.register(_release_lock, watcher_lock_name, watcher_lock_handle)
 
     try:
         from memu.storage_layout import migrate_legacy_single_db_to_agent_db
@@ -653,7 +990,7 @@ if __name__ == "__main__":
     agent_dirs_json = os.getenv("MEMU_AGENT_DIRS")
     if agent_dirs_json:
         try:
-            agent_dirs = json.loads(agent_dirs_json)
+            agent_dirs = _json_loads(agent_dirs_json)
             print(f"Monitoring {len(agent_dirs)} agent(s): {', '.join(agent_dirs.keys())}")
         except json.JSONDecodeError as e:
             print(f"Error parsing MEMU_AGENT_DIRS: {e}")
@@ -676,14 +1013,14 @@ if __name__ == "__main__":
         flush_poll_seconds=flush_poll_seconds,
     )
 
+    shutdown_event = threading.Event()
+
     def _shutdown_handler(signum, frame):
-        try:
-            observer.stop()
-        finally:
-            _release_lock(watcher_lock_name, watcher_lock_handle)
+        shutdown_event.set()
+        observer.stop()
         raise SystemExit(0)
 
-    # Ensure SIGTERM/SIGINT releases the singleton lock.
+    # SIGTERM/SIGINT exit through SystemExit so atexit releases the lock.
     signal.signal(signal.SIGTERM, _shutdown_handler)
     signal.signal(signal.SIGINT, _shutdown_handler)
 
@@ -692,26 +1029,45 @@ if __name__ == "__main__":
     if extra_paths:
         docs_handler = SyncHandler("docs_ingest.py", [".md"])
         # Watch directories recursively; if a file path is provided, watch its parent directory.
-        watched_dirs: set[tuple[str, bool]] = set()
+        candidate_dirs: dict[tuple[str, bool], str] = {}
         for path_item in extra_paths:
-            if not os.path.exists(path_item):
+            # One stat per path: exists + isdir each cost their own syscall.
+            try:
+                st = os.stat(path_item)
+            except OSError:
                 print(f"Warning: Extra path {path_item} not found.")
                 continue
 
-            if os.path.isdir(path_item):
+            if stat.S_ISDIR(st.st_mode):
                 watch_dir = path_item
                 recursive = True
             else:
                 watch_dir = os.path.dirname(path_item) or "."
                 recursive = False
 
-            key = (watch_dir, recursive)
-            if key in watched_dirs:
+            # Dedupe on the resolved path so "/a//b", "./b" and symlinked
+            # spellings of one directory don't install redundant watches.
+            candidate_dirs.setdefault((os.path.realpath(watch_dir), recursive), watch_dir)
+
+        # Schedule a minimal covering set: ancestors before descendants
+        # (shortest path first, recursive variant of a dir first), dropping
+        # anything already under a kept recursive watch. Overlapping trees
+        # would otherwise deliver every event to the handler twice and burn
+        # extra inotify descriptors, a bounded per-user kernel resource.
+        covered_recursive: list[str] = []
+        for (real_dir, recursive), watch_dir in sorted(
+            candidate_dirs.items(), key=lambda kv: (len(kv[0][0]), kv[0][0], not kv[0][1])
+        ):
+            if any(
+                real_dir == c or real_dir.startswith(c + os.sep)
+                for c in covered_recursive
+            ):
                 continue
-            watched_dirs.add(key)
+            if recursive:
+                covered_recursive.append(real_dir)
 
             print(f"Watching docs: {watch_dir}")
-            observer.schedule(docs_handler, watch_dir, recursive=recursive)
+            _schedule_watch(observer, docs_handler, watch_dir, recursive=recursive)
         # Trigger initial docs sync ONCE per data dir.
         # Full-scan is expensive/noisy; we rely on incremental runs for ongoing updates.
         marker = _docs_full_scan_marker_path()
@@ -721,9 +1077,12 @@ if __name__ == "__main__":
             docs_handler.trigger_sync()
 
     observer.start()
+    # File events are fully handled by the observer threads; this thread only
+    # needs to wake for the idle-flush/reconcile cadence, so wait on the
+    # shutdown event instead of spinning a 1s sleep (~86k wakeups/day).
+    poll_interval = max(1, flush_poll_seconds or 60)
     try:
-        while True:
-            time.sleep(1)
+        while not shutdown_event.wait(poll_interval):
             agent_states = _reconcile_agent_watchers(
                 agent_dirs=agent_dirs,
                 agent_states=agent_states,
@@ -745,6 +1104,4 @@ if __name__ == "__main__":
                 )
     except KeyboardInterrupt:
         observer.stop()
-    finally:
-        _release_lock(watcher_lock_name, watcher_lock_handle)
     observer.join()